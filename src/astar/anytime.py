@@ -0,0 +1,137 @@
+import math
+import time
+from array import array
+from heapq import heapify, heappop, heappush
+
+from src.astar.astar import ID_LIMIT, AStar
+from src.astar.heuristic import Heuristic
+from src.util.time_measure import measure_time
+from src.util.types import Board, BoundLog, BoundLogResult, MWISBase
+
+
+class AnytimeAStar(AStar):
+    """Weighted A* that lowers its weight on each incumbent and can stop at any time."""
+
+    def __init__(
+        self,
+        board: Board,
+        num_of_cards: int,
+        heuristic: Heuristic | None = None,
+        *,
+        weight: float = 2.0,
+        weight_step: float = 0.5,
+        deadline: float | None = None,
+        max_expansions: int | None = None,
+        incumbent: MWISBase | None = None,
+        log_every: int = 1000,
+    ) -> None:
+        self.start_time = time.perf_counter()
+        self.weight = max(weight, 1.0)
+        self.weight_step = weight_step
+        self.deadline = deadline
+        self.max_expansions = max_expansions
+        self.log_every = log_every
+        self.f_rewards = array("q")
+        super().__init__(board, num_of_cards, heuristic)
+        self.best_profit, self.best_path = incumbent or (0, [0] * len(board))
+        self.best_state: int | None = None
+        self.log: BoundLog = ([], [], [], [])
+
+    def _priority(self, state_id: int) -> int:
+        g_reward = self.states.g_rewards[state_id]
+        return g_reward + math.floor((self.f_rewards[state_id] - g_reward) / self.weight)
+
+    def _enqueue_state(self, state_id: int, f_reward: int) -> None:
+        self.f_rewards.append(f_reward)
+        heappush(self.queue, -self._priority(state_id) * ID_LIMIT + state_id)
+        self.heap_peak = max(self.heap_peak, len(self.queue))
+
+    def _reorder_queue(self) -> None:
+        self.queue = [
+            -self._priority(state_id) * ID_LIMIT + state_id
+            for state_id in (entry % ID_LIMIT for entry in self.queue)
+            if self.f_rewards[state_id] > self.best_profit
+        ]
+        heapify(self.queue)
+
+    def _update_incumbent(self) -> None:
+        self.best_profit = self.current_g_reward
+        self.best_state = self.current_state
+        if self.weight > 1.0:
+            self.weight = max(1.0, self.weight - self.weight_step)
+            self._reorder_queue()
+
+    def upper_bound(self) -> int:
+        open_bound = max((self.f_rewards[entry % ID_LIMIT] for entry in self.queue), default=0)
+        return max(int(self.best_profit), open_bound)
+
+    def _is_out_of_budget(self) -> bool:
+        if self.max_expansions is not None and self.expanded >= self.max_expansions:
+            return True
+        return self.deadline is not None and self.elapsed() >= self.deadline
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    def _poll(self) -> None:
+        """Called every `log_every` expansions, before the progress is logged."""
+
+    def _log_progress(self) -> None:
+        iterations, values, timestamps, bounds = self.log
+        iterations.append(self.expanded)
+        values.append(self.best_profit)
+        timestamps.append(self.elapsed())
+        bounds.append(self.upper_bound())
+
+    def run(self) -> BoundLogResult:
+        start = time.perf_counter()
+        self._log_progress()
+        while self.queue and not self._is_out_of_budget():
+            self._set_current_state(heappop(self.queue) % ID_LIMIT)
+            if self.f_rewards[self.current_state] <= self.best_profit:
+                continue
+            if self._is_current_state_terminal():
+                self._update_incumbent()
+                self._log_progress()
+                continue
+            self._expand_current_state()
+            if self.expanded % self.log_every == 0:
+                self._poll()
+                self._log_progress()
+        self._log_progress()
+
+        if self.best_state is not None:
+            self.best_path = self._reconstruct_path(self.best_state)
+        upper_bound = self.upper_bound()
+        stats = self._stats(start)
+        stats.update(
+            upper_bound=upper_bound,
+            gap=(upper_bound - self.best_profit) / max(upper_bound, 1),
+            final_weight=self.weight,
+        )
+        return int(self.best_profit), self.best_path, self.log, stats
+
+
+@measure_time()
+def run_anytime_astar(
+    board: Board,
+    max_cards: int,
+    *,
+    heuristic: Heuristic | None = None,
+    weight: float = 2.0,
+    weight_step: float = 0.5,
+    deadline: float | None = None,
+    max_expansions: int | None = None,
+    incumbent: MWISBase | None = None,
+) -> BoundLogResult:
+    astar = AnytimeAStar(
+        board,
+        max_cards,
+        heuristic,
+        weight=weight,
+        weight_step=weight_step,
+        deadline=deadline,
+        max_expansions=max_expansions,
+        incumbent=incumbent,
+    )
+    return astar.run()
@@ -0,0 +1,133 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.dp.max_plus import add_row, max_over_compatible
+from src.util.mask_tables import (
+    IntArray,
+    get_board_array,
+    get_compatibility_matrix,
+    get_mask_weights,
+    get_masks_bits_matrix,
+    get_popcounts,
+)
+from src.util.types import Board
+
+
+class Heuristic(ABC):
+    """Admissible bound table indexed by (col, previous mask index, cards left)."""
+
+    @abstractmethod
+    def precompute(self, board: Board, masks: list[int], num_of_cards: int) -> IntArray:
+        pass
+
+    @abstractmethod
+    def __str__(self) -> str:
+        pass
+
+
+def backward_card_dp(
+    mask_values: IntArray, masks: list[int], precomputed: IntArray, start_col: int, end_col: int
+) -> None:
+    """Fills precomputed[start_col:end_col] with the best reward using at most c cards."""
+    popcounts = get_popcounts(masks)
+    compatibility = get_compatibility_matrix(masks)
+    for i in range(end_col - 1, start_col - 1, -1):
+        table = add_row(precomputed[i + 1], mask_values[i], popcounts)
+        best, _ = max_over_compatible(table, compatibility)
+        np.maximum(best, 0, out=precomputed[i])
+        precomputed[i, :, 0] = 0
+
+
+def backward_dp[T: np.number](mask_values: NDArray[T], masks: list[int]) -> NDArray[T]:
+    """Best reward from column i onwards given the previous mask, with no card limit."""
+    compatibility = get_compatibility_matrix(masks)
+    precomputed = np.zeros((len(mask_values) + 1, len(masks)), dtype=mask_values.dtype)
+    for i in range(len(mask_values) - 1, -1, -1):
+        following = mask_values[i] + precomputed[i + 1]
+        precomputed[i] = np.where(compatibility, following[None, :], -np.inf).max(axis=1)
+    return precomputed
+
+
+def _empty_table(board: Board, masks: list[int], num_of_cards: int) -> IntArray:
+    return np.zeros((len(board) + 1, len(masks), num_of_cards + 1), dtype=np.int64)
+
+
+class BlockBound(Heuristic):
+    """Exact card DP on positive values within column blocks, top-k values before the last."""
+
+    def __init__(self, block_size: int = 10) -> None:
+        self.block_size = block_size
+
+    def precompute(self, board: Board, masks: list[int], num_of_cards: int) -> IntArray:
+        positive = np.maximum(get_board_array(board), 0)
+        mask_values = positive @ get_masks_bits_matrix(masks, positive.shape[1]).T
+        global_max_sum = self._compute_global_max_sum(positive, num_of_cards)
+        precomputed = _empty_table(board, masks, num_of_cards)
+
+        for start_col in range(len(board) - 1, -1, -self.block_size):
+            end_col = min(start_col + self.block_size, len(board))
+            backward_card_dp(mask_values, masks, precomputed, start_col, end_col)
+            self._propagate_block_bounds(start_col, global_max_sum, precomputed)
+
+        return precomputed
+
+    def _compute_global_max_sum(self, positive: IntArray, num_of_cards: int) -> IntArray:
+        values = positive.ravel()
+        flat_positive = -np.sort(-values[values > 0])
+        global_max_sum = np.zeros(num_of_cards + 1, dtype=np.int64)
+        prefix = np.cumsum(flat_positive)[:num_of_cards]
+        global_max_sum[1 : len(prefix) + 1] = prefix
+        global_max_sum[len(prefix) + 1 :] = prefix[-1] if len(prefix) else 0
+        return global_max_sum
+
+    def _propagate_block_bounds(
+        self, start_col: int, global_max_sum: IntArray, precomputed: IntArray
+    ) -> None:
+        if start_col > 0:
+            prev_block_start = max(0, start_col - self.block_size)
+            for i in range(start_col - 1, prev_block_start - 1, -1):
+                np.maximum(precomputed[i + 1], global_max_sum[None, :], out=precomputed[i])
+
+    def __str__(self) -> str:
+        return f"block-{self.block_size}"
+
+
+class UnlimitedCardsBound(Heuristic):
+    """Exact backward DP on the real values, ignoring the card limit."""
+
+    def precompute(self, board: Board, masks: list[int], num_of_cards: int) -> IntArray:
+        table = backward_dp(get_mask_weights(board, masks), masks)
+        return np.broadcast_to(table[:, :, None], (len(board) + 1, len(masks), num_of_cards + 1))
+
+    def __str__(self) -> str:
+        return "unlimited-cards"
+
+
+class LagrangianBound(Heuristic):
+    """max over placements of (value - multiplier * cards) + multiplier * cards_left."""
+
+    def __init__(self, multiplier: float) -> None:
+        self.multiplier = multiplier
+
+    def precompute(self, board: Board, masks: list[int], num_of_cards: int) -> IntArray:
+        penalized = get_mask_weights(board, masks) - self.multiplier * get_popcounts(masks)
+        table = backward_dp(penalized, masks)
+        cards_left = self.multiplier * np.arange(num_of_cards + 1)
+        return np.floor(table[:, :, None] + cards_left[None, None, :] + 1e-9).astype(np.int64)
+
+    def __str__(self) -> str:
+        return f"lagrangian-{self.multiplier:g}"
+
+
+class ExactBound(Heuristic):
+    """Full backward DP with the card limit: the perfect heuristic."""
+
+    def precompute(self, board: Board, masks: list[int], num_of_cards: int) -> IntArray:
+        precomputed = _empty_table(board, masks, num_of_cards)
+        backward_card_dp(get_mask_weights(board, masks), masks, precomputed, 0, len(board))
+        return precomputed
+
+    def __str__(self) -> str:
+        return "exact"
@@ -1,28 +1,41 @@
-from typing import Optional
-
-
-class State:
-    def __init__(
-        self,
-        g_reward: int,
-        h_reward: int,
-        col_index: int,
-        previous_mask: int,
-        cards_used: int,
-        parent: Optional["State"] = None,
-    ) -> None:
-        self.col_index = col_index
-        self.previous_mask = previous_mask
-        self.cards_used = cards_used
-        self.g_reward = g_reward
-        self.h_reward = h_reward
-        self.parent = parent
-
-    def f_reward(self) -> int:
-        return self.g_reward + self.h_reward
-
-    def __lt__(self, other: "State") -> bool:
-        return self.f_reward() > other.f_reward()
-
-    def key(self) -> tuple[int, int, int]:
-        return (self.col_index, self.previous_mask, self.cards_used)
+from array import array
+
+NO_PARENT = -1
+
+
+class StateCodec:
+    """Packs a (col_index, mask_index, cards_used) search state into a single int."""
+
+    def __init__(self, n_cols: int, n_masks: int, n_cards: int) -> None:
+        self.n_masks = n_masks
+        self.n_cards = n_cards
+        self.size = (n_cols + 1) * n_masks * n_cards
+
+    def pack(self, col_index: int, mask_index: int, cards_used: int) -> int:
+        return (col_index * self.n_masks + mask_index) * self.n_cards + cards_used
+
+    def unpack(self, key: int) -> tuple[int, int, int]:
+        rest, cards_used = divmod(key, self.n_cards)
+        col_index, mask_index = divmod(rest, self.n_masks)
+        return col_index, mask_index, cards_used
+
+
+class StateStorage:
+    """Append-only arrays of generated states; a state is referred to by its index."""
+
+    def __init__(self) -> None:
+        self.g_rewards = array("q")
+        self.keys = array("q")
+        self.parents = array("q")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, g_reward: int, key: int, parent: int = NO_PARENT) -> int:
+        self.g_rewards.append(g_reward)
+        self.keys.append(key)
+        self.parents.append(parent)
+        return len(self.keys) - 1
+
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.g_rewards, self.keys, self.parents))
@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.astar.heuristic import Heuristic, backward_dp
+from src.dp.lagrangian import lagrangian_dual
+from src.dp.max_plus import ChoiceArray
+from src.util.mask_tables import (
+    BoolArray,
+    IntArray,
+    get_compatibility_matrix,
+    get_mask_weights,
+    get_popcounts,
+)
+from src.util.time_measure import measure_time
+from src.util.types import Board, MWISBase
+from src.util.util import generate_non_adjacent_masks
+
+type ParentArray = NDArray[np.int32]
+# (row, mask indices, cards used) -> optimistic value of rows row.. for each state
+type ScoreArray = NDArray[np.floating | np.integer]
+type SuffixBound = Callable[[int, IntArray, IntArray], ScoreArray]
+
+MULTIPLIER_ITERATIONS = 20
+
+
+@dataclass
+class Beam:
+    """Partial placements of rows 0..i, one entry per (last mask, cards used) pair."""
+
+    mask_indices: IntArray
+    cards: IntArray
+    values: IntArray
+    parents: ParentArray
+
+    @classmethod
+    def initial(cls, empty_mask_index: int) -> "Beam":
+        return cls(
+            np.array([empty_mask_index]),
+            np.zeros(1, dtype=np.int64),
+            np.zeros(1, dtype=np.int64),
+            np.zeros(1, dtype=np.int32),
+        )
+
+    def expand(
+        self, row_weights: IntArray, popcounts: IntArray, compatibility: BoolArray, max_cards: int
+    ) -> "Beam":
+        """Children within the card limit, deduplicated by (mask, cards) on the best value."""
+        cards = self.cards[:, None] + popcounts[None, :]
+        valid = compatibility[self.mask_indices] & (cards <= max_cards)
+        parents, mask_indices = np.nonzero(valid)
+        cards = cards[valid]
+        values = self.values[parents] + row_weights[mask_indices]
+
+        order = np.lexsort((-values, cards, mask_indices))
+        keys = (mask_indices * (max_cards + 1) + cards)[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        kept = order[first]
+        return Beam(mask_indices[kept], cards[kept], values[kept], parents[kept].astype(np.int32))
+
+    def prune(self, scores: ScoreArray, beam_width: int) -> "Beam":
+        if len(scores) <= beam_width:
+            return self
+        kept = np.sort(np.argsort(-scores, kind="stable")[:beam_width])
+        return Beam(
+            self.mask_indices[kept], self.cards[kept], self.values[kept], self.parents[kept]
+        )
+
+
+def lagrangian_suffix_bound(
+    weights: IntArray,
+    masks: list[int],
+    popcounts: IntArray,
+    compatibility: BoolArray,
+    max_cards: int,
+) -> SuffixBound:
+    """`LagrangianBound` at the dual-optimal multiplier, as a table plus a linear card term."""
+    *_, multiplier = lagrangian_dual(
+        weights, popcounts, compatibility, max_cards, MULTIPLIER_ITERATIONS
+    )
+    table = backward_dp(weights - multiplier * popcounts, masks)
+    return lambda row, mask_indices, cards: (
+        table[row, mask_indices] + multiplier * (max_cards - cards)
+    )
+
+
+def heuristic_suffix_bound(
+    heuristic: Heuristic, board: Board, masks: list[int], max_cards: int
+) -> SuffixBound:
+    table = heuristic.precompute(board, masks, max_cards)
+    return lambda row, mask_indices, cards: table[row, mask_indices, max_cards - cards]
+
+
+@measure_time()
+def mwis_beam_search(
+    board: Board, max_cards: int, *, beam_width: int = 128, heuristic: Heuristic | None = None
+) -> MWISBase:
+    """Row-by-row scan keeping the `beam_width` placements with the best value plus bound."""
+    masks = generate_non_adjacent_masks(len(board[0]))
+    weights = get_mask_weights(board, masks)
+    popcounts = get_popcounts(masks)
+    compatibility = get_compatibility_matrix(masks)
+    if heuristic is None:
+        suffix_bound = lagrangian_suffix_bound(weights, masks, popcounts, compatibility, max_cards)
+    else:
+        suffix_bound = heuristic_suffix_bound(heuristic, board, masks, max_cards)
+
+    beam = Beam.initial(masks.index(0))
+    # Only what path reconstruction needs is kept for the past rows.
+    history: list[tuple[ChoiceArray, ParentArray]] = []
+    for row_index in range(len(board)):
+        beam = beam.expand(weights[row_index], popcounts, compatibility, max_cards)
+        suffix = suffix_bound(row_index + 1, beam.mask_indices, beam.cards)
+        beam = beam.prune(beam.values + suffix, beam_width)
+        history.append((beam.mask_indices.astype(np.uint8), beam.parents))
+
+    state = int(beam.values.argmax())
+    value = int(beam.values[state])
+    path: list[int] = []
+    for mask_indices, parents in reversed(history):
+        path.append(masks[int(mask_indices[state])])
+        state = int(parents[state])
+    path.reverse()
+    return value, path
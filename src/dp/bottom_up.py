@@ -1,4 +1,8 @@
-from src.util.types import Board, MWISResult
+from typing import Literal
+
+from src.dp.bottom_up_numpy import mwis_bottom_up_numpy
+from src.util.time_measure import measure_time
+from src.util.types import Board, MWISBase
 from src.util.util import (
     calculate_row_sum,
     generate_non_adjacent_masks,
@@ -6,13 +10,27 @@ from src.util.util import (
     get_masks_compatibility,
     merge_compatibility,
 )
-from src.util.time_measure import measure_time
 
-type Tabulation = dict[tuple[int, int], tuple[int, list[int]]]
+type Tabulation = dict[tuple[int, int], int]
+type Backpointers = list[bytearray]
+type Engine = Literal["dict", "numpy"]
 
 
 def create_tabulation(masks: list[int]) -> Tabulation:
-    return {(m, 0): (0, []) for m in masks}
+    return {(m, 0): 0 for m in masks}
+
+
+def reconstruct_path(
+    backpointers: Backpointers, masks: list[int], n_cards: int, mask: int, cards_used: int
+) -> list[int]:
+    mask_index = {m: i for i, m in enumerate(masks)}
+    path = [mask]
+    for pointers in reversed(backpointers[1:]):
+        previous = pointers[mask_index[mask] * n_cards + cards_used]
+        cards_used -= mask.bit_count()
+        mask = masks[previous]
+        path.append(mask)
+    return path
 
 
 @measure_time()
@@ -21,15 +39,26 @@ def mwis_bottom_up(
     max_cards: int,
     initial_mask: int = 0,
     final_mask: int = 0,
-) -> MWISResult:
+    *,
+    engine: Engine = "dict",
+    checkpoint_every: int | None = None,
+) -> MWISBase:
+    if engine == "numpy":
+        return mwis_bottom_up_numpy(board, max_cards, initial_mask, final_mask, checkpoint_every)
+    if checkpoint_every is not None:
+        raise ValueError("checkpointed reconstruction is only available for the numpy engine")
     possible_masks = generate_non_adjacent_masks(len(board[0]))
     masks_bit_count = get_masks_bit_count(possible_masks)
     compatibility = get_masks_compatibility(possible_masks)
+    mask_index = {m: i for i, m in enumerate(possible_masks)}
+    n_cards = min(max_cards, len(board) * max(masks_bit_count.values())) + 1
     tab = create_tabulation(possible_masks)
+    backpointers: Backpointers = []
 
     for row_index in range(len(board) - 1, -1, -1):
         next_tab: Tabulation = {}
-        for (previous_mask, cards_used), (accumulated_sum, path) in tab.items():
+        pointers = bytearray(len(possible_masks) * n_cards)
+        for (previous_mask, cards_used), accumulated_sum in tab.items():
             comp = compatibility[previous_mask]
             if row_index == 0:
                 comp = merge_compatibility(comp, compatibility[initial_mask])
@@ -41,8 +70,10 @@ def mwis_bottom_up(
                     continue
                 key = (mask, c)
                 new_sum = accumulated_sum + calculate_row_sum(board[row_index], mask)
-                max_sum, _ = next_tab.get(key, (0, []))
-                if new_sum >= max_sum:
-                    next_tab[key] = new_sum, [mask] + path
+                if new_sum >= next_tab.get(key, 0):
+                    next_tab[key] = new_sum
+                    pointers[mask_index[mask] * n_cards + c] = mask_index[previous_mask]
+        backpointers.append(pointers)
         tab = next_tab
-    return max(tab.values(), key=lambda x: x[0])
+    (mask, cards_used), max_sum = max(tab.items(), key=lambda x: x[1])
+    return max_sum, reconstruct_path(backpointers, possible_masks, n_cards, mask, cards_used)
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from src.dp.max_plus import ChoiceArray, add_row, max_over_compatible, terminal_table
+from src.util.mask_tables import (
+    NEG_INF,
+    BoolArray,
+    IntArray,
+    get_compatibility_matrix,
+    get_compatible_with,
+    get_mask_weights,
+    get_popcounts,
+)
+from src.util.types import Board, MWISBase
+from src.util.util import generate_non_adjacent_masks
+
+
+class DPInterrupted(Exception):
+    pass
+
+
+@dataclass
+class DenseContext:
+    masks: list[int]
+    weights: IntArray
+    popcounts: IntArray
+    compatibility: BoolArray
+    terminal: IntArray
+
+    @classmethod
+    def create(cls, board: Board, max_cards: int, final_mask: int = 0) -> "DenseContext":
+        masks = generate_non_adjacent_masks(len(board[0]))
+        popcounts = get_popcounts(masks)
+        n_cards = min(max_cards, len(board) * int(popcounts.max())) + 1
+        return cls(
+            masks,
+            get_mask_weights(board, masks),
+            popcounts,
+            get_compatibility_matrix(masks),
+            terminal_table(get_compatible_with(masks, final_mask), n_cards),
+        )
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.weights)
+
+    def backward(
+        self, first_row: int, last_row: int, table: IntArray | None = None
+    ) -> Iterator[tuple[int, IntArray, ChoiceArray | None]]:
+        """Yields (row, table, choice) from `last_row - 1` down to `first_row`."""
+        for row_index in range(last_row - 1, first_row - 1, -1):
+            if table is None:
+                best, choice = self.terminal, None
+            else:
+                best, choice = max_over_compatible(table, self.compatibility)
+            table = add_row(best, self.weights[row_index], self.popcounts)
+            yield row_index, table, choice
+
+
+def mwis_bottom_up_numpy(
+    board: Board,
+    max_cards: int,
+    initial_mask: int = 0,
+    final_mask: int = 0,
+    checkpoint_every: int | None = None,
+    interrupt: Callable[[], bool] | None = None,
+) -> MWISBase:
+    """Raises `DPInterrupted` as soon as `interrupt`, checked once per row, returns True."""
+    context = DenseContext.create(board, max_cards, final_mask)
+    n_rows = context.n_rows
+    step = checkpoint_every or n_rows
+    checkpoints: dict[int, IntArray] = {}
+    choices: dict[int, ChoiceArray] = {}
+
+    table = context.terminal
+    for row_index, table, choice in context.backward(0, n_rows):
+        if interrupt is not None and interrupt():
+            raise DPInterrupted
+        if checkpoint_every is None and choice is not None:
+            choices[row_index] = choice
+        elif checkpoint_every is not None and row_index % step == 0:
+            checkpoints[row_index] = table
+
+    table[~get_compatible_with(context.masks, initial_mask)] = NEG_INF
+    f, c = divmod(int(table.argmax()), table.shape[1])
+    value = int(table[f, c])
+    path = [context.masks[f]]
+    for first_row in range(0, n_rows, step):
+        last_row = min(first_row + step, n_rows)
+        if checkpoint_every is not None:
+            segment = context.backward(first_row, last_row, checkpoints.get(last_row))
+            choices = {row: choice for row, _, choice in segment if choice is not None}
+        for row_index in range(first_row, min(last_row, n_rows - 1)):
+            c -= int(context.popcounts[f])
+            f = int(choices[row_index][f, c])
+            path.append(context.masks[f])
+    return value, path
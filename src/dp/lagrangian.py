@@ -0,0 +1,132 @@
+import math
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.dp.max_plus import ChoiceArray, add_row, max_over_compatible
+from src.util.mask_tables import (
+    NEG_INF,
+    BoolArray,
+    IntArray,
+    get_compatibility_matrix,
+    get_mask_weights,
+    get_popcounts,
+)
+from src.util.time_measure import measure_time
+from src.util.types import Board, StatsResult
+from src.util.util import generate_non_adjacent_masks
+
+type FloatArray = NDArray[np.float64]
+
+EPSILON = 1e-9
+
+
+def penalized_dp(weights: FloatArray, compatibility: BoolArray) -> list[int]:
+    """Best mask sequence without a card limit, as mask indices per row."""
+    n_rows, n_masks = weights.shape
+    value = weights[0].copy()
+    choices: ChoiceArray = np.zeros((n_rows, n_masks), dtype=np.uint8)
+    for row_index in range(1, n_rows):
+        candidates = np.where(compatibility, value[None, :], -np.inf)
+        choices[row_index] = candidates.argmax(axis=1)
+        value = candidates.max(axis=1) + weights[row_index]
+    f = int(value.argmax())
+    path = [f]
+    for row_index in range(n_rows - 1, 0, -1):
+        f = int(choices[row_index, f])
+        path.append(f)
+    path.reverse()
+    return path
+
+
+def banded_dp(
+    weights: IntArray,
+    popcounts: IntArray,
+    compatibility: BoolArray,
+    center: IntArray,
+    max_cards: int,
+    band: int,
+) -> tuple[int, list[int]]:
+    """Exact DP over placements whose prefix card counts stay within `band` of `center`."""
+    n_rows, n_masks = weights.shape
+    offsets = np.arange(-band, band + 1)
+    row_cards = np.diff(center, prepend=0)
+    table = np.full((n_masks, 2 * band + 1), NEG_INF, dtype=np.int64)
+    table[:, band] = 0
+    choices: ChoiceArray = np.zeros((n_rows, n_masks, 2 * band + 1), dtype=np.uint8)
+    for row_index in range(n_rows):
+        if row_index > 0:
+            table, choices[row_index] = max_over_compatible(table, compatibility)
+        table = add_row(table, weights[row_index], popcounts - row_cards[row_index])
+        table[:, center[row_index] + offsets > max_cards] = NEG_INF
+
+    f, j = divmod(int(table.argmax()), table.shape[1])
+    value = int(table[f, j])
+    path = [f]
+    for row_index in range(n_rows - 1, 0, -1):
+        j -= int(popcounts[f] - row_cards[row_index])
+        f = int(choices[row_index, f, j])
+        path.append(f)
+    path.reverse()
+    return value, path
+
+
+def lagrangian_dual(
+    weights: IntArray,
+    popcounts: IntArray,
+    compatibility: BoolArray,
+    max_cards: int,
+    max_iter: int = 60,
+) -> tuple[int, list[int], float, float]:
+    """Bisection on the card multiplier: best primal value and path, dual bound, multiplier."""
+    rows = np.arange(len(weights))
+
+    def solve(multiplier: float) -> tuple[int, int, list[int]]:
+        path = penalized_dp(weights - multiplier * popcounts, compatibility)
+        return int(weights[rows, path].sum()), int(popcounts[path].sum()), path
+
+    primal, cards, path = solve(0.0)
+    dual, best_multiplier = float(primal), 0.0
+    if cards > max_cards:
+        primal, path, dual = 0, [0] * len(weights), math.inf
+        low, high = 0.0, float(weights.max(initial=0)) + 1.0
+        for _ in range(max_iter):
+            multiplier = (low + high) / 2
+            value, cards, candidate = solve(multiplier)
+            if value + multiplier * (max_cards - cards) < dual:
+                dual, best_multiplier = value + multiplier * (max_cards - cards), multiplier
+            if cards <= max_cards:
+                high = multiplier
+                if value > primal:
+                    primal, path = value, candidate
+            else:
+                low = multiplier
+            if cards == max_cards or primal >= math.floor(dual + EPSILON):
+                break
+    return primal, path, dual, best_multiplier
+
+
+@measure_time()
+def mwis_lagrangian(
+    board: Board, max_cards: int, *, band: int = 16, max_iter: int = 60
+) -> StatsResult:
+    masks = generate_non_adjacent_masks(len(board[0]))
+    weights = get_mask_weights(board, masks)
+    popcounts = get_popcounts(masks)
+    compatibility = get_compatibility_matrix(masks)
+    primal, path, dual, _ = lagrangian_dual(weights, popcounts, compatibility, max_cards, max_iter)
+
+    lagrangian_primal = primal
+    full_band = min(max_cards, len(board) * int(popcounts.max()))
+    width = 0
+    while primal < math.floor(dual + EPSILON) and width < full_band:
+        width = min(2 * width or band, full_band)
+        center = np.cumsum(popcounts[path])
+        value, candidate = banded_dp(weights, popcounts, compatibility, center, max_cards, width)
+        if value > primal:
+            primal, path = value, candidate
+    if width == full_band:
+        dual = float(primal)
+
+    stats = {"lagrangian_primal": lagrangian_primal, "dual_bound": dual, "band": width}
+    return primal, [masks[f] for f in path], stats
@@ -0,0 +1,34 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from src.util.mask_tables import NEG_INF, BoolArray, IntArray
+
+type ChoiceArray = NDArray[np.uint8]
+
+
+def max_over_compatible(table: IntArray, compatibility: BoolArray) -> tuple[IntArray, ChoiceArray]:
+    """Max of table[g, c] over masks g compatible with each f; leading axes are batches."""
+    candidates = np.where(compatibility[:, :, None], table[..., None, :, :], NEG_INF)
+    choice = candidates.argmax(axis=-2)
+    best = np.take_along_axis(candidates, choice[..., None, :], axis=-2)[..., 0, :]
+    return best, choice.astype(np.uint8)
+
+
+def add_row(best: IntArray, row_weights: IntArray, shifts: IntArray) -> IntArray:
+    """Places each mask on top of `best`, shifting the card axis by `shifts`; batched."""
+    n_cards = best.shape[-1]
+    table = np.full_like(best, NEG_INF)
+    for f, shift in enumerate(shifts.tolist()):
+        weight = row_weights[..., f, None]
+        if 0 <= shift < n_cards:
+            table[..., f, shift:] = best[..., f, : n_cards - shift] + weight
+        elif -n_cards < shift < 0:
+            table[..., f, :shift] = best[..., f, -shift:] + weight
+    return table
+
+
+def terminal_table(allowed: BoolArray, n_cards: int) -> IntArray:
+    """Continuation values past the last row: zero cards, only masks in `allowed`."""
+    table = np.full((len(allowed), n_cards), NEG_INF, dtype=np.int64)
+    table[allowed, 0] = 0
+    return table
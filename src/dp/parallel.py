@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, TypeVar
+
+import numpy as np
+
+from src.dp.bottom_up_numpy import mwis_bottom_up_numpy
+from src.util.mask_tables import (
+    NEG_INF,
+    IntArray,
+    get_compatibility_matrix,
+    get_mask_weights,
+    get_popcounts,
+)
+from src.util.time_measure import measure_time
+from src.util.types import Board, MWISBase
+from src.util.util import generate_non_adjacent_masks
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+type Chunk = tuple[int, int]
+
+
+def transfer_table(board: Board, max_cards: int) -> IntArray:
+    """table[p, x, c]: best value with at most c cards, mask p above and x on the last row."""
+    masks = generate_non_adjacent_masks(len(board[0]))
+    weights = get_mask_weights(board, masks)
+    popcounts = get_popcounts(masks)
+    compatibility = get_compatibility_matrix(masks)
+    n_masks = len(masks)
+    n_cards = min(max_cards, len(board) * int(popcounts.max())) + 1
+
+    table = np.full((n_masks, n_masks, n_cards), NEG_INF, dtype=np.int64)
+    for f, pc in enumerate(popcounts.tolist()):
+        if pc < n_cards:
+            table[compatibility[f], f, pc] = weights[0, f]
+    for row_index in range(1, len(board)):
+        candidates = np.where(compatibility[None, :, :, None], table[:, None, :, :], NEG_INF)
+        best = candidates.max(axis=2)
+        table = np.full_like(best, NEG_INF)
+        for g, pc in enumerate(popcounts.tolist()):
+            if pc < n_cards:
+                table[:, g, pc:] = best[:, g, : n_cards - pc] + weights[row_index, g]
+        np.maximum(table, NEG_INF, out=table)
+    return np.maximum.accumulate(table, axis=2)
+
+
+@dataclass
+class MergedTable:
+    table: IntArray
+    via_mask: IntArray
+    via_cards: IntArray
+
+
+def merge_tables(first: IntArray, second: IntArray, max_cards: int) -> MergedTable:
+    """Max-plus product of adjacent transfer tables over the boundary mask and card split."""
+    n_masks = first.shape[0]
+    n_cards = min(first.shape[2] + second.shape[2] - 1, max_cards + 1)
+    table = np.full((n_masks, n_masks, n_cards), NEG_INF, dtype=np.int64)
+    via_mask = np.zeros_like(table)
+    via_cards = np.zeros_like(table)
+    for c1 in range(min(first.shape[2], n_cards)):
+        end = min(n_cards, c1 + second.shape[2])
+        candidates = first[:, :, c1, None, None] + second[None, :, :, : end - c1]
+        y = candidates.argmax(axis=1)
+        value = np.take_along_axis(candidates, y[:, None], axis=1)[:, 0]
+        better = value > table[:, :, c1:end]
+        table[:, :, c1:end][better] = value[better]
+        via_mask[:, :, c1:end][better] = y[better]
+        via_cards[:, :, c1:end][better] = c1
+    np.maximum(table, NEG_INF, out=table)
+    return MergedTable(table, via_mask, via_cards)
+
+
+def _merge_pair(args: tuple[IntArray, IntArray, int]) -> MergedTable:
+    return merge_tables(*args)
+
+
+def _transfer_table(args: tuple[Board, int]) -> IntArray:
+    return transfer_table(*args)
+
+
+def chunk_path(board: Board, entry_mask: int, exit_mask: int, max_cards: int) -> list[int]:
+    """Best path of a chunk whose last row is fixed to `exit_mask`."""
+    if len(board) == 1:
+        return [exit_mask]
+    result = mwis_bottom_up_numpy(
+        board[:-1], max_cards - exit_mask.bit_count(), entry_mask, exit_mask
+    )
+    return result[1] + [exit_mask]
+
+
+def _chunk_path(args: tuple[Board, int, int, int]) -> list[int]:
+    return chunk_path(*args)
+
+
+def split_chunks(n_rows: int, n_chunks: int) -> list[Chunk]:
+    bounds = np.linspace(0, n_rows, min(n_chunks, n_rows) + 1).astype(int).tolist()
+    return list(zip(bounds, bounds[1:]))
+
+
+def _run(executor: Executor | None, func: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+    return executor.map(func, items) if executor is not None else map(func, items)
+
+
+@measure_time()
+def mwis_parallel(
+    board: Board, max_cards: int, *, n_chunks: int | None = None, n_workers: int | None = None
+) -> MWISBase:
+    n_workers = n_workers or os.cpu_count() or 1
+    chunks = split_chunks(len(board), n_chunks or n_workers)
+    masks = generate_non_adjacent_masks(len(board[0]))
+    executor = ProcessPoolExecutor(n_workers) if n_workers > 1 else None
+    try:
+        tables = list(_run(executor, _transfer_table, [(board[a:b], max_cards) for a, b in chunks]))
+        levels: list[list[MergedTable]] = []
+        while len(tables) > 1:
+            pairs = [(tables[i], tables[i + 1], max_cards) for i in range(0, len(tables) - 1, 2)]
+            levels.append(list(_run(executor, _merge_pair, pairs)))
+            tables = [merged.table for merged in levels[-1]] + tables[len(pairs) * 2 :]
+
+        root = tables[0]
+        c = root.shape[2] - 1
+        x = int(root[0, :, c].argmax())
+        value = int(root[0, x, c])
+        boundaries = [(masks.index(0), x, c)]
+        for level in reversed(levels):
+            split: list[tuple[int, int, int]] = []
+            for merged, (p, x, c) in zip(level, boundaries):
+                y, c1 = int(merged.via_mask[p, x, c]), int(merged.via_cards[p, x, c])
+                split.extend([(p, y, c1), (y, x, c - c1)])
+            boundaries = split + boundaries[len(level) :]
+
+        args = [
+            (board[a:b], masks[p], masks[x], c) for (a, b), (p, x, c) in zip(chunks, boundaries)
+        ]
+        path = [mask for chunk in _run(executor, _chunk_path, args) for mask in chunk]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return value, path
@@ -0,0 +1,132 @@
+from typing import Any
+
+import numpy as np
+
+from src.dp.bottom_up_numpy import DenseContext
+from src.util.mask_tables import IntArray
+from src.util.stopping import pad_to_longest
+from src.util.time_measure import measure_time
+from src.util.types import Board, MWISResult, MWISSolver, Stats
+
+
+def split_segments(board: Board) -> list[tuple[int, int]]:
+    """Maximal runs [first_row, last_row) of rows holding at least one positive value."""
+    segments: list[tuple[int, int]] = []
+    first_row = None
+    for row_index, row in enumerate(board):
+        if any(v > 0 for v in row):
+            if first_row is None:
+                first_row = row_index
+        elif first_row is not None:
+            segments.append((first_row, row_index))
+            first_row = None
+    if first_row is not None:
+        segments.append((first_row, len(board)))
+    return segments
+
+
+def value_curve(board: Board, max_cards: int) -> IntArray:
+    """Best value using at most k cards, for every k up to what the board can hold."""
+    context = DenseContext.create(board, max_cards)
+    table = context.terminal
+    for _, table, _ in context.backward(0, context.n_rows):
+        pass
+    return np.maximum.accumulate(table.max(axis=0))
+
+
+def allocate_budget(curves: list[IntArray], max_cards: int) -> list[int]:
+    """Splits the card budget between segments by max-plus convolution of their value curves."""
+    total = np.zeros(1, dtype=np.int64)
+    splits: list[IntArray] = []
+    for curve in curves:
+        n_cards = min(len(total) + len(curve) - 1, max_cards + 1)
+        merged = np.full(n_cards, np.iinfo(np.int64).min, dtype=np.int64)
+        split = np.zeros(n_cards, dtype=np.int64)
+        for k, value in enumerate(curve[:n_cards].tolist()):
+            end = min(n_cards, k + len(total))
+            candidate = total[: end - k] + value
+            better = candidate > merged[k:end]
+            merged[k:end][better] = candidate[better]
+            split[k:end][better] = k
+        total = merged
+        splits.append(split)
+
+    budgets: list[int] = []
+    k = int(total.argmax())
+    for split in reversed(splits):
+        budgets.append(int(split[k]))
+        k -= budgets[-1]
+    budgets.reverse()
+    return budgets
+
+
+# Per-segment peaks and settings, combined by their largest value instead of summed.
+MAX_STATS = {"heap_peak", "memory_bytes", "band", "final_weight"}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+
+def _combine_stats(segments: list[Stats], value: int | None) -> Stats:
+    stats: Stats = {}
+    for segment in segments:
+        for key, item in segment.items():
+            if key not in stats:
+                stats[key] = item
+            elif item is None:
+                stats[key] = None
+            elif isinstance(item, bool):
+                stats[key] = stats[key] and item
+            elif _is_number(item) and _is_number(stats[key]):
+                stats[key] = max(stats[key], item) if key in MAX_STATS else stats[key] + item
+    if "bytes_per_expanded" in stats:
+        expanded = sum(segment["expanded"] for segment in segments)
+        memory = sum(segment["memory_bytes"] for segment in segments)
+        stats["bytes_per_expanded"] = memory / max(expanded, 1)
+    if "gap" in stats:
+        upper_bound = stats.get("upper_bound")
+        if value is None or upper_bound is None:
+            stats["gap"] = None
+        else:
+            stats["gap"] = (upper_bound - value) / max(upper_bound, 1)
+    return stats
+
+
+def combine_extras(extras: list[Any], value: int | None = None) -> Any:
+    """Combines per-segment stats and logs; ratios are recomputed, `gap` from the total `value`."""
+    if isinstance(extras[0], dict):
+        return _combine_stats(extras, value)
+    iterations = max((log[0] for log in extras), key=len)
+    values = np.sum(pad_to_longest([log[1] for log in extras]), axis=0)
+    timestamps = np.max(pad_to_longest([log[2] for log in extras]), axis=0)
+    if len(extras[0]) == 3:
+        return iterations, values.tolist(), timestamps.tolist()
+    # Bound logs also carry the upper bounds, which add up like the values.
+    bounds = np.sum(pad_to_longest([log[3] for log in extras]), axis=0)
+    return iterations, values.tolist(), timestamps.tolist(), bounds.tolist()
+
+
+class Presolved:
+    """Runs `solver` on the independent segments of the board, with budgets from the DP curves."""
+
+    def __init__(self, solver: MWISSolver) -> None:
+        self.solver = solver
+
+    @measure_time()
+    def __call__(self, board: Board, max_cards: int, *args: Any, **kwargs: Any) -> MWISResult:
+        segments = split_segments(board) or [(0, len(board))]
+        if segments == [(0, len(board))]:
+            result, _ = self.solver(board, max_cards, *args, **kwargs)
+            return result
+
+        curves = [value_curve(board[first:last], max_cards) for first, last in segments]
+        budgets = allocate_budget(curves, max_cards)
+        value, path = 0, [0] * len(board)
+        extras: list[tuple[Any, ...]] = []
+        for (first_row, last_row), budget in zip(segments, budgets):
+            result, _ = self.solver(board[first_row:last_row], budget, *args, **kwargs)
+            value += result[0]
+            path[first_row:last_row] = result[1]
+            extras.append(result[2:])
+        return value, path, *(combine_extras(list(extra), value) for extra in zip(*extras))
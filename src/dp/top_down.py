@@ -1,5 +1,8 @@
+from array import array
+from dataclasses import dataclass
+
 from src.util.time_measure import measure_time
-from src.util.types import Board, MWISResult
+from src.util.types import Board, MWISBase
 from src.util.util import (
     calculate_row_sum,
     generate_non_adjacent_masks,
@@ -8,40 +11,94 @@ from src.util.util import (
     merge_compatibility,
 )
 
-type Memoization = dict[int, dict[tuple[int, int], tuple[int, list[int]]]]
+UNVISITED = -1
+
+
+@dataclass
+class Memoization:
+    """Flat (row, mask index, cards) tables: best suffix sum and index of the mask chosen."""
+
+    n_masks: int
+    n_cards: int
+    values: array[int]
+    choices: bytearray
+
+    @classmethod
+    def create(cls, n_rows: int, n_masks: int, n_cards: int) -> "Memoization":
+        size = n_rows * n_masks * n_cards
+        return cls(n_masks, n_cards, array("q", [UNVISITED]) * size, bytearray(size))
 
+    def index(self, row_index: int, mask_index: int, cards_used: int) -> int:
+        return (row_index * self.n_masks + mask_index) * self.n_cards + cards_used
 
-def create_memoization(n_rows: int) -> Memoization:
-    return {i: {} for i in range(n_rows)}
+
+def reconstruct_path(
+    memo: Memoization, masks: list[int], n_rows: int, max_cards: int, initial_mask: int
+) -> list[int]:
+    path: list[int] = []
+    cards_used, mask_index = 0, masks.index(initial_mask)
+    while len(path) < n_rows and cards_used < max_cards:
+        mask_index = memo.choices[memo.index(len(path), mask_index, cards_used)]
+        cards_used += masks[mask_index].bit_count()
+        path.append(masks[mask_index])
+    return path + [0] * (n_rows - len(path))
 
 
 @measure_time()
 def mwis_top_down(
     board: Board, max_cards: int, *, initial_mask: int = 0, final_mask: int = 0
-) -> MWISResult:
+) -> MWISBase:
+    n_rows = len(board)
     possible_masks = generate_non_adjacent_masks(len(board[0]))
+    mask_index = {m: i for i, m in enumerate(possible_masks)}
     compatibility = get_masks_compatibility(possible_masks)
+    last_row_compatibility = {
+        m: merge_compatibility(comp, compatibility[final_mask]) for m, comp in compatibility.items()
+    }
     masks_bit_count = get_masks_bit_count(possible_masks)
-    memo = create_memoization(len(board))
-
-    def dsf(row_index: int, cards_used: int, previous_mask: int) -> tuple[int, list[int]]:
-        if row_index == len(board) or cards_used >= max_cards:
-            return 0, []
-        key = (previous_mask, cards_used)
-        if key not in memo[row_index]:
-            max_sum, best_path = 0, []
-            comp = compatibility[previous_mask]
-            if row_index == len(board) - 1:
-                comp = merge_compatibility(compatibility[previous_mask], compatibility[final_mask])
-            for mask in comp:
-                c = cards_used + masks_bit_count[mask]
-                if c <= max_cards:
-                    new_sum, p = dsf(row_index + 1, c, mask)
-                    new_sum += calculate_row_sum(board[row_index], mask)
-                    if new_sum > max_sum:
-                        max_sum = new_sum
-                        best_path = [mask] + p
-            memo[row_index][key] = (max_sum, best_path)
-        return memo[row_index][key]
-
-    return dsf(0, 0, initial_mask)
+    n_cards = min(max_cards, n_rows * max(masks_bit_count.values())) + 1
+    memo = Memoization.create(n_rows, len(possible_masks), n_cards)
+
+    def is_terminal(row_index: int, cards_used: int) -> bool:
+        return row_index == n_rows or cards_used >= max_cards
+
+    def children(row_index: int, cards_used: int, previous_mask: int) -> list[tuple[int, int]]:
+        comp = compatibility if row_index < n_rows - 1 else last_row_compatibility
+        return [
+            (mask, cards_used + masks_bit_count[mask])
+            for mask in comp[previous_mask]
+            if cards_used + masks_bit_count[mask] <= max_cards
+        ]
+
+    if is_terminal(0, 0):
+        return 0, [0] * n_rows
+    stack = [(0, 0, initial_mask)]
+    while stack:
+        row_index, cards_used, previous_mask = stack[-1]
+        key = memo.index(row_index, mask_index[previous_mask], cards_used)
+        if memo.values[key] != UNVISITED:
+            stack.pop()
+            continue
+        pending = [
+            (row_index + 1, c, mask)
+            for mask, c in children(row_index, cards_used, previous_mask)
+            if not is_terminal(row_index + 1, c)
+            and memo.values[memo.index(row_index + 1, mask_index[mask], c)] == UNVISITED
+        ]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        max_sum, best_mask = 0, 0
+        for mask, c in children(row_index, cards_used, previous_mask):
+            new_sum = calculate_row_sum(board[row_index], mask)
+            if not is_terminal(row_index + 1, c):
+                new_sum += memo.values[memo.index(row_index + 1, mask_index[mask], c)]
+            if new_sum > max_sum:
+                max_sum = new_sum
+                best_mask = mask
+        memo.values[key] = max_sum
+        memo.choices[key] = mask_index[best_mask]
+
+    max_sum = memo.values[memo.index(0, mask_index[initial_mask], 0)]
+    return max_sum, reconstruct_path(memo, possible_masks, n_rows, max_cards, initial_mask)
@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.dp.max_plus import ChoiceArray, add_row, max_over_compatible
+from src.util.mask_tables import NEG_INF, BoolArray, IntArray
+
+
+@dataclass
+class WindowBatch:
+    """Exact DP of equally long windows, each between two fixed boundary masks."""
+
+    first_table: IntArray
+    choices: list[ChoiceArray]
+    popcounts: IntArray
+
+    @classmethod
+    def solve(
+        cls,
+        weights: IntArray,
+        initial_indices: IntArray,
+        final_indices: IntArray,
+        popcounts: IntArray,
+        compatibility: BoolArray,
+        n_cards: int,
+    ) -> "WindowBatch":
+        """`weights` has shape (windows, rows, masks); the boundary masks are given as indices."""
+        n_windows, n_rows, n_masks = weights.shape
+        table = np.full((n_windows, n_masks, n_cards), NEG_INF, dtype=np.int64)
+        table[..., 0] = np.where(compatibility[final_indices], 0, NEG_INF)
+        table = add_row(table, weights[:, -1], popcounts)
+        choices: list[ChoiceArray] = []
+        for row_index in range(n_rows - 2, -1, -1):
+            best, choice = max_over_compatible(table, compatibility)
+            table = add_row(best, weights[:, row_index], popcounts)
+            choices.append(choice)
+        choices.reverse()
+        allowed = compatibility[initial_indices]
+        table[~allowed] = NEG_INF
+        return cls(table, choices, popcounts)
+
+    @property
+    def nbytes(self) -> int:
+        return self.first_table.nbytes + sum(choice.nbytes for choice in self.choices)
+
+    def curves(self) -> IntArray:
+        """Best value of every window using at most c cards."""
+        return np.maximum.accumulate(self.first_table.max(axis=1), axis=1)
+
+    def paths(self, budgets: IntArray) -> IntArray:
+        """Mask indices of the best placement of every window within its card budget."""
+        n_windows, _, n_cards = self.first_table.shape
+        exact = self.first_table.max(axis=1)
+        exact[np.arange(n_cards)[None, :] > budgets[:, None]] = NEG_INF
+        cards = exact.argmax(axis=1)
+        windows = np.arange(int(n_windows))
+        masks = self.first_table[windows, :, cards].argmax(axis=1)
+        paths = [masks]
+        for choice in self.choices:
+            cards = cards - self.popcounts[masks]
+            masks = choice[windows, masks, cards].astype(np.int64)
+            paths.append(masks)
+        return np.stack(paths, axis=1)
@@ -0,0 +1,168 @@
+import os
+import random
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import pandas as pd
+
+from src.astar.astar import run_astar
+from src.astar.heuristic import (
+    BlockBound,
+    ExactBound,
+    Heuristic,
+    LagrangianBound,
+    UnlimitedCardsBound,
+)
+from src.dp.bottom_up import mwis_bottom_up
+from src.dp.parallel import mwis_parallel
+from src.dp.presolve import Presolved
+from src.experiment.config import PHASES, AlgorithmConfig, BoardInstance, ExperimentPhase
+from src.experiment.distribution import SkewedDistribution, UniformDistribution
+from src.main import SEED
+from src.util.types import Board, MWISResult
+
+BENCHMARKS_PATH = Path("results") / "benchmarks"
+SUMMARY_COLUMNS = ["time", "expanded", "heap_peak", "precompute_time", "search_time"]
+
+type BenchmarkSolver = Callable[[Board, int], tuple[MWISResult, float]]
+
+
+def get_phase(name: str) -> ExperimentPhase:
+    return next(phase for phase in PHASES if phase.name == name)
+
+
+def generate_boards(phase: ExperimentPhase, seed: int = SEED) -> Iterator[BoardInstance]:
+    """Yields the same boards (ids and seeds) that `ExperimentRunner` generates for the phase."""
+    rng = random.Random(seed)
+    board_id = 0
+    for board_config in phase.create_board_configs():
+        for _ in range(phase.boards_per_config):
+            yield board_config.generate_instance(board_id, rng.randint(0, 2**32 - 1))
+            board_id += 1
+
+
+def benchmark_solvers(
+    phase: ExperimentPhase,
+    solvers: dict[str, BenchmarkSolver],
+    max_cards_percents: list[float],
+    seed: int = SEED,
+) -> pd.DataFrame:
+    rows: list[dict[str, Any]] = []
+    for board in generate_boards(phase, seed):
+        for max_cards_percent in max_cards_percents:
+            max_cards = max(1, int(board.size * max_cards_percent))
+            for name, solver in solvers.items():
+                result, elapsed = solver(board.board, max_cards)
+                row: dict[str, Any] = {
+                    "solver": name,
+                    "board_id": board.board_id,
+                    "n_rows": board.config.n_rows,
+                    "max_cards_percent": max_cards_percent,
+                    "value": result[0],
+                    "time": elapsed,
+                }
+                for extra in result[2:]:
+                    if isinstance(extra, dict):
+                        row.update(extra)
+                rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def summarize(df: pd.DataFrame, values: str = "time") -> pd.DataFrame:
+    return df.pivot_table(index=["n_rows", "max_cards_percent"], columns="solver", values=values)
+
+
+def bottom_up_engines() -> pd.DataFrame:
+    solvers: dict[str, BenchmarkSolver] = {
+        "dict": mwis_bottom_up,
+        "numpy": partial(mwis_bottom_up, engine="numpy"),
+    }
+    return benchmark_solvers(get_phase("scaling"), solvers, [1.0])
+
+
+def presolve() -> pd.DataFrame:
+    phase = ExperimentPhase(
+        name="skewed",
+        board_heights=[500],
+        distributions=[SkewedDistribution(-1000, 1000, r) for r in (0.5, 0.7, 0.9)],
+        max_cards_percents=[0.1, 0.25],
+        boards_per_config=3,
+    )
+    numpy_bottom_up = partial(mwis_bottom_up, engine="numpy")
+    solvers: dict[str, BenchmarkSolver] = {
+        "dynamic-bottom-up": numpy_bottom_up,
+        "dynamic-bottom-up-presolve": Presolved(numpy_bottom_up),
+        "astar": run_astar,
+        "astar-presolve": Presolved(run_astar),
+    }
+    return benchmark_solvers(phase, solvers, phase.max_cards_percents)
+
+
+def parallel_dp() -> pd.DataFrame:
+    phase = ExperimentPhase(
+        name="long",
+        board_heights=[10_000, 20_000],
+        distributions=[UniformDistribution(-1000, 1000)],
+        max_cards_percents=[0.001, 0.005],
+        boards_per_config=2,
+    )
+    solvers: dict[str, BenchmarkSolver] = {"serial": partial(mwis_bottom_up, engine="numpy")}
+    n_workers = 1
+    while n_workers <= (os.cpu_count() or 1):
+        solvers[f"parallel-{n_workers}"] = partial(mwis_parallel, n_workers=n_workers)
+        n_workers *= 2
+    return benchmark_solvers(phase, solvers, phase.max_cards_percents)
+
+
+def astar_heuristics() -> pd.DataFrame:
+    heuristics: list[Heuristic] = [
+        BlockBound(5),
+        BlockBound(10),
+        BlockBound(20),
+        UnlimitedCardsBound(),
+        LagrangianBound(100),
+        LagrangianBound(300),
+        ExactBound(),
+    ]
+    solvers: dict[str, BenchmarkSolver] = {
+        str(h): partial(run_astar, heuristic=h) for h in heuristics
+    }
+    return benchmark_solvers(get_phase("scaling"), solvers, [0.25, 1.0])
+
+
+def ga_engines() -> pd.DataFrame:
+    phase = get_phase("genetic")
+    solvers: dict[str, BenchmarkSolver] = {}
+    for name in ("ga", "ga-numpy"):
+        config = AlgorithmConfig.default_algo_config(name)
+        assert config.param_grid is not None
+        params = {key: values[0] for key, values in config.param_grid.items()}
+        solvers[name] = partial(config.solver, rng=random.Random(SEED), **params)
+    return benchmark_solvers(phase, solvers, phase.max_cards_percents)
+
+
+BENCHMARKS: dict[str, Callable[[], pd.DataFrame]] = {
+    "bottom-up-engines": bottom_up_engines,
+    "presolve": presolve,
+    "parallel-dp": parallel_dp,
+    "astar-heuristics": astar_heuristics,
+    "ga-engines": ga_engines,
+}
+
+
+def main(names: list[str]) -> None:
+    BENCHMARKS_PATH.mkdir(parents=True, exist_ok=True)
+    for name in names or list(BENCHMARKS):
+        df = BENCHMARKS[name]()
+        df.to_csv(BENCHMARKS_PATH / f"{name}.csv", index=False)
+        print(f"=== {name} ===")
+        for values in SUMMARY_COLUMNS:
+            if values in df.columns:
+                print(f"--- {values} ---")
+                print(summarize(df, values).to_string())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,27 +1,52 @@
 import json
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from itertools import product
 from pathlib import Path
 from typing import Any, Iterator, Literal
 
 import numpy as np
 
+from src.astar.anytime import run_anytime_astar
 from src.astar.astar import run_astar
+from src.beam.beam_search import mwis_beam_search
 from src.dp.bottom_up import mwis_bottom_up
+from src.dp.lagrangian import mwis_lagrangian
+from src.dp.parallel import mwis_parallel
+from src.dp.presolve import Presolved
 from src.dp.top_down import mwis_top_down
 from src.experiment.distribution import UniformDistribution, ValueDistribution
+from src.ga.array_genetic_algorithm import run_array_genetic_algorithm
 from src.ga.crossover import crossover
 from src.ga.genetic_algorithm import run_genetic_algorithm
+from src.ga.islands import run_island_genetic_algorithm
 from src.ga.mutation import mutation
 from src.ga.q import q
 from src.ga.reproduction import reproduction
 from src.ga.succession import elitism
 from src.greedy.greedy_and_repair import greedy_and_repair
+from src.portfolio.portfolio import mwis_portfolio
 from src.util.types import Board, MWISSolver
 
 N_COLUMNS = 4
-type AlgorithmName = Literal["dynamic-top-down", "dynamic-bottom-up", "astar", "greedy", "ga"]
+# Solver parameters counting iterations, replaced by a deadline in time-budget sweeps
+ITERATION_PARAMS = ("n_iter", "fes")
+type AlgorithmName = Literal[
+    "dynamic-top-down",
+    "dynamic-bottom-up",
+    "dynamic-parallel",
+    "astar",
+    "astar-anytime",
+    "beam",
+    "greedy",
+    "greedy-batched",
+    "ga",
+    "ga-numpy",
+    "ga-islands",
+    "ga-memetic",
+    "lagrangian",
+    "portfolio",
+]
 
 
 @dataclass
@@ -74,6 +99,7 @@ class AlgorithmConfig:
     name: str
     param_grid: dict[str, list[Any]] | None = None
     is_deterministic: bool = True
+    sequential: bool = False
 
     @classmethod
     def default_algo_config(cls, name: AlgorithmName) -> "AlgorithmConfig":
@@ -92,8 +118,52 @@ class AlgorithmConfig:
                     param_grid=None,
                     is_deterministic=True,
                 )
+            case "dynamic-parallel":
+                return cls(
+                    name="dynamic-parallel",
+                    solver=mwis_parallel,
+                    param_grid=None,
+                    is_deterministic=True,
+                    sequential=True,
+                )
             case "astar":
-                return cls(name="astar", solver=run_astar, param_grid=None, is_deterministic=True)
+                return cls(
+                    name="astar",
+                    solver=run_astar,
+                    param_grid=None,
+                    is_deterministic=True,
+                    sequential=True,
+                )
+            case "astar-anytime":
+                return cls(
+                    name="astar-anytime",
+                    solver=run_anytime_astar,
+                    param_grid={"weight": [5.0], "max_expansions": [1000, 10000]},
+                    is_deterministic=True,
+                    sequential=True,
+                )
+            case "beam":
+                return cls(
+                    name="beam",
+                    solver=mwis_beam_search,
+                    param_grid={"beam_width": [1, 16, 256]},
+                    is_deterministic=True,
+                )
+            case "lagrangian":
+                return cls(
+                    name="lagrangian",
+                    solver=mwis_lagrangian,
+                    param_grid=None,
+                    is_deterministic=True,
+                )
+            case "portfolio":
+                return cls(
+                    name="portfolio",
+                    solver=mwis_portfolio,
+                    param_grid=None,
+                    is_deterministic=True,
+                    sequential=True,
+                )
             case "ga":
                 return cls(
                     name="ga",
@@ -109,6 +179,63 @@ class AlgorithmConfig:
                         "probability_of_crossover": [0.95],
                         "fes": [10000],
                         "num_of_best_survivors": [2],
+                        "repair": ["random", "value-refill"],
+                    },
+                    is_deterministic=False,
+                )
+            case "ga-memetic":
+                return cls(
+                    name="ga-memetic",
+                    solver=run_genetic_algorithm,
+                    param_grid={
+                        "q": [q],
+                        "mutation": [mutation],
+                        "crossover": [crossover],
+                        "reproduction": [reproduction],
+                        "succession": [elitism],
+                        "population_count": [50],
+                        "probability_of_mutation": [0.01],
+                        "probability_of_crossover": [0.95],
+                        "fes": [10000],
+                        "num_of_best_survivors": [2],
+                        "memetic": [True],
+                        "local_search_top_k": [0, 2],
+                        "local_search_steps": [5],
+                    },
+                    is_deterministic=False,
+                )
+            case "ga-islands":
+                return cls(
+                    name="ga-islands",
+                    solver=run_island_genetic_algorithm,
+                    param_grid={
+                        "q": [q],
+                        "mutation": [mutation],
+                        "crossover": [crossover],
+                        "reproduction": [reproduction],
+                        "succession": [elitism],
+                        "population_count": [50],
+                        "probability_of_mutation": [0.01],
+                        "probability_of_crossover": [0.95],
+                        "fes": [10000],
+                        "num_of_best_survivors": [2],
+                        "n_islands": [4],
+                        "migration_interval": [10],
+                        "topology": ["ring", "random"],
+                    },
+                    is_deterministic=False,
+                    sequential=True,
+                )
+            case "ga-numpy":
+                return cls(
+                    name="ga-numpy",
+                    solver=run_array_genetic_algorithm,
+                    param_grid={
+                        "population_count": [50],
+                        "probability_of_mutation": [0.01],
+                        "probability_of_crossover": [0.95],
+                        "fes": [10000],
+                        "num_of_best_survivors": [2],
                     },
                     is_deterministic=False,
                 )
@@ -116,21 +243,66 @@ class AlgorithmConfig:
                 return cls(
                     name="greedy",
                     solver=greedy_and_repair,
-                    param_grid={"n_iter": [200], "region_percent_size": [0.05]},
+                    param_grid={
+                        "n_iter": [200],
+                        "region_percent_size": [0.05],
+                        "selection": ["random", "gain"],
+                    },
                     is_deterministic=False,
                 )
+            case "greedy-batched":
+                return cls(
+                    name="greedy-batched",
+                    solver=greedy_and_repair,
+                    param_grid={
+                        "n_iter": [200],
+                        "region_percent_size": [0.01],
+                        "windows_per_sweep": [64],
+                    },
+                    is_deterministic=False,
+                )
+
+    def with_presolve(self) -> "AlgorithmConfig":
+        return replace(self, solver=Presolved(self.solver), name=f"{self.name}-presolve")
+
+    @property
+    def supports_time_budget(self) -> bool:
+        return self.param_grid is not None and any(p in self.param_grid for p in ITERATION_PARAMS)
+
+    def with_time_budgets(self, budgets: list[float]) -> "AlgorithmConfig":
+        """Sweeps the wall-clock `deadline` (seconds) instead of the iteration count."""
+        if not self.supports_time_budget:
+            raise ValueError(f"{self.name} has no iteration budget to replace")
+        assert self.param_grid is not None
+        param_grid = {
+            key: [None] if key in ITERATION_PARAMS else values
+            for key, values in self.param_grid.items()
+        }
+        param_grid["deadline"] = budgets
+        return replace(self, param_grid=param_grid, name=f"{self.name}-timed")
 
     @staticmethod
-    def get_default_configs() -> list["AlgorithmConfig"]:
+    def get_default_configs(
+        presolve: bool = False, time_budgets: list[float] | None = None
+    ) -> list["AlgorithmConfig"]:
         names: list[AlgorithmName] = [
             "dynamic-bottom-up",
             "dynamic-top-down",
             "ga",
+            "ga-numpy",
+            "ga-memetic",
             "astar",
             "greedy",
+            "lagrangian",
+            "beam",
         ]
 
-        return [AlgorithmConfig.default_algo_config(name) for name in names]
+        configs = [AlgorithmConfig.default_algo_config(name) for name in names]
+        if time_budgets is not None:
+            configs = [
+                c.with_time_budgets(time_budgets) if c.supports_time_budget else c for c in configs
+            ]
+        return [c.with_presolve() for c in configs] if presolve else configs
 
     def get_configurations(self) -> Iterator[dict[str, Any]]:
         if self.param_grid is None:
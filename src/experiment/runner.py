@@ -11,6 +11,8 @@ import numpy as np
 import pandas as pd
 
 from src.experiment.config import AlgorithmConfig, BoardConfig, ExperimentPhase
+from src.util.stopping import pad_to_longest
+from src.util.types import LogResult, LogStatsResult
 
 type SingleExperimentTask = tuple[
     AlgorithmConfig, BoardConfig, int, int, float, int, dict[str, Any]
@@ -114,9 +116,8 @@ class ExperimentRunner:
 
         tasks = list(all_tasks())
 
-        sequential_names = {"dynamic-top-down", "astar"}
-        sequential_tasks = [t for t in tasks if t[0].name in sequential_names]
-        parallel_tasks = [t for t in tasks if t[0].name not in sequential_names]
+        sequential_tasks = [t for t in tasks if t[0].sequential]
+        parallel_tasks = [t for t in tasks if not t[0].sequential]
 
         return sequential_tasks, parallel_tasks
 
@@ -172,27 +173,38 @@ def _run_single_experiment(task: SingleExperimentTask) -> SingleExperimentResult
     max_cards = max(1, int(board.size * max_cards_percent))
     if algo.is_deterministic:
         result, elapsed = algo.solver(board.board, max_cards, **params)
-        assert len(result) == 2
-        value, _ = result
+        value = result[0]
         res: dict[str, Any] = {"value": value, "time": elapsed}
+        bound_log_info: dict[str, Any] | None = None
+        for extra in result[2:]:
+            if isinstance(extra, dict):
+                res.update(extra)
+            else:
+                columns = ["iter", "value", "time", "bound"]
+                bound_log_info = {"algo": algo.name, **dict(zip(columns, extra))}
         base.update(params)
         base.update(res)
-        return base, None
+        return base, bound_log_info
 
     else:
         times: list[float] = []
         values: list[int] = []
         logs: list[list[float]] = []
-        iterations = None
+        log_times: list[list[float]] = []
+        stats: list[dict[str, Any]] = []
+        iterations: list[int] = []
 
         for _ in range(repetitions):
             result, elapsed = algo.solver(board.board, max_cards, **solver_params)
-            assert len(result) == 3
-            value, _, log = result
-            iterations, log_value = log
+            assert len(result) in (3, 4)
+            value, _, log, *extra = cast(LogResult | LogStatsResult, result)
+            log_iterations, log_value, log_time = log
+            iterations = max(iterations, log_iterations, key=len)
             times.append(elapsed)
             values.append(value)
             logs.append(log_value)
+            log_times.append(log_time)
+            stats.extend(extra)
 
         results: dict[str, Any] = {
             "num_trials": repetitions,
@@ -203,13 +215,21 @@ def _run_single_experiment(task: SingleExperimentTask) -> SingleExperimentResult
             "time_mean": np.mean(times),
             "time_std": np.std(times),
         }
-
-        log_array = np.array(logs)
+        if stats:
+            means = pd.DataFrame(stats).mean(numeric_only=True)
+            results.update({f"{key}_mean": value for key, value in means.items()})
+
+        # Runs stopped by a deadline or patience differ in length: a finished run keeps its
+        # last value, and its time is left out of later iterations.
+        log_array = np.array(pad_to_longest(logs))
+        length = log_array.shape[1]
+        time_array = np.array([t + [np.nan] * (length - len(t)) for t in log_times])
         log_info: dict[str, Any] = {
             "algo": algo.name,
             "iter": iterations,
             "eval_mean": np.mean(log_array, axis=0),
             "eval_std": np.std(log_array, axis=0),
+            "time_mean": np.nanmean(time_array, axis=0),
         }
 
         base.update(params)
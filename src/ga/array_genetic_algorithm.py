@@ -0,0 +1,140 @@
+import random
+
+import numpy as np
+
+from src.ga.population import (
+    PopulationArray,
+    elitism,
+    evaluate,
+    get_gene_values,
+    mutate,
+    random_population,
+    tournament,
+    two_point_crossover,
+)
+from src.ga.type_definitions import Board
+from src.util.stopping import StoppingCriterion
+from src.util.time_measure import measure_time
+from src.util.types import LogResult
+
+
+class ArrayGeneticAlgorithm:
+    """`GeneticAlgorithm` with the population held as one gene array."""
+
+    def __init__(
+        self,
+        population_count: int,
+        probability_of_mutation: float,
+        probability_of_crossover: float,
+        fes: int | None,
+        num_of_cards: int,
+        board: Board,
+        num_of_best_survivors: int = 0,
+        starting_population: PopulationArray | None = None,
+        rng: np.random.Generator | None = None,
+        deadline: float | None = None,
+        patience: int | None = None,
+        target: float | None = None,
+    ):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.population_count = population_count
+        self.probability_of_mutation = probability_of_mutation
+        self.probability_of_crossover = probability_of_crossover
+        self.t_max = None if fes is None else fes // population_count
+        self.t = 0
+        self.board = board
+        self.num_of_cards = num_of_cards
+        self.num_of_best_survivors = num_of_best_survivors
+        self.deadline = deadline
+        self.patience = patience
+        self.target = target
+        self.gene_values = get_gene_values(board)
+        self.population = (
+            starting_population
+            if starting_population is not None
+            else random_population(population_count, len(board), num_of_cards, self.rng)
+        )
+        self.evaluation = evaluate(self.population, self.gene_values)
+        best = int(self.evaluation.argmax())
+        self.best_unit, self.best_value = self.population[best].copy(), int(self.evaluation[best])
+
+    def _stop(self) -> bool:
+        return self.stopping.should_stop()
+
+    def reproduction(self) -> None:
+        self.r_population = tournament(
+            self.population, self.evaluation, self.population_count, self.rng
+        )
+
+    def crossover(self) -> None:
+        self.c_population = two_point_crossover(
+            self.r_population,
+            self.probability_of_crossover,
+            self.population_count,
+            self.num_of_cards,
+            self.rng,
+        )
+
+    def mutation(self) -> None:
+        self.m_population = mutate(
+            self.c_population, self.probability_of_mutation, self.num_of_cards, self.rng
+        )
+
+    def succession(self) -> None:
+        self.population, self.evaluation = elitism(
+            self.m_population,
+            self.m_evaluation,
+            self.population,
+            self.evaluation,
+            self.num_of_best_survivors,
+        )
+
+    @measure_time()
+    def run(self) -> LogResult:
+        self.stopping = StoppingCriterion(self.t_max, self.deadline, self.patience, self.target)
+        self.stopping.update(self.best_value)
+        while not self._stop():
+            self.reproduction()
+            self.crossover()
+            self.mutation()
+            self.m_evaluation = evaluate(self.m_population, self.gene_values)
+            best = int(self.m_evaluation.argmax())
+            if self.m_evaluation[best] > self.best_value:
+                self.best_unit = self.m_population[best].copy()
+                self.best_value = int(self.m_evaluation[best])
+            self.stopping.update(self.best_value)
+            self.succession()
+            self.t += 1
+        return self.best_value, self.best_unit.tolist(), self.stopping.log
+
+
+def run_array_genetic_algorithm(
+    board: Board,
+    num_of_cards: int,
+    *,
+    population_count: int,
+    probability_of_mutation: float,
+    probability_of_crossover: float,
+    fes: int | None,
+    num_of_best_survivors: int = 0,
+    starting_population: PopulationArray | None = None,
+    rng: random.Random | None = None,
+    deadline: float | None = None,
+    patience: int | None = None,
+    target: float | None = None,
+) -> tuple[LogResult, float]:
+    ga = ArrayGeneticAlgorithm(
+        population_count,
+        probability_of_mutation,
+        probability_of_crossover,
+        fes,
+        num_of_cards,
+        board,
+        num_of_best_survivors,
+        starting_population,
+        np.random.default_rng(rng.getrandbits(64) if rng is not None else None),
+        deadline,
+        patience,
+        target,
+    )
+    return ga.run()
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from itertools import accumulate
+from operator import getitem
+
+from src.ga.q import QFunc, q
+from src.ga.type_definitions import Board
+from src.ga.unit import Unit
+from src.util.types import Stats
+
+FITNESS_CACHE_SIZE = 4096
+
+
+class FitnessEvaluator:
+    """Fitness of units by delta evaluation from their parents or a genes-keyed LRU."""
+
+    def __init__(self, q_func: QFunc, board: Board, maxsize: int = FITNESS_CACHE_SIZE) -> None:
+        self.q = q_func
+        self.board = board
+        self.maxsize = maxsize
+        self.delta = q_func is q
+        self.row_values = [
+            [sum(value for col, value in enumerate(row) if gene >> col & 1) for gene in range(16)]
+            for row in board
+        ]
+        self.cache: OrderedDict[tuple[int, ...], int] = OrderedDict()
+        self.evaluations = 0
+        self.delta_evaluations = 0
+        self.cache_hits = 0
+
+    def __call__(self, unit: Unit) -> int:
+        if unit.fitness is not None:
+            self.cache_hits += 1
+            return unit.fitness
+        return self._fitness(unit)
+
+    def _fitness(self, unit: Unit) -> int:
+        if unit.fitness is not None:
+            return unit.fitness
+        if self.delta and unit.parent is not None:
+            unit.fitness = self._delta_fitness(unit, unit.parent)
+            self.delta_evaluations += 1
+        else:
+            key = tuple(unit.genes)
+            if (fitness := self.cache.get(key)) is not None:
+                self.cache.move_to_end(key)
+                self.cache_hits += 1
+            else:
+                fitness = self.q(unit, self.board)
+                self.evaluations += 1
+                self.cache[key] = fitness
+                if len(self.cache) > self.maxsize:
+                    self.cache.popitem(last=False)
+            unit.fitness = fitness
+        # Ancestors are only needed until the fitness is known.
+        unit.parent = unit.donor = None
+        unit.changes = None
+        return unit.fitness
+
+    def _delta_fitness(self, unit: Unit, parent: Unit) -> int:
+        fitness = self._fitness(parent)
+        if unit.donor is not None and unit.cuts is not None:
+            first, last = unit.cuts
+            donor_prefix, parent_prefix = self._prefix(unit.donor), self._prefix(parent)
+            fitness += donor_prefix[last] - donor_prefix[first]
+            fitness -= parent_prefix[last] - parent_prefix[first]
+        assert unit.changes is not None
+        for row, old_gene in unit.changes.items():
+            values = self.row_values[row]
+            fitness += values[unit.genes[row]] - values[old_gene]
+        return fitness
+
+    def _prefix(self, unit: Unit) -> list[int]:
+        if unit.prefix is None:
+            unit.prefix = [0, *accumulate(map(getitem, self.row_values, unit.genes))]
+        return unit.prefix
+
+    def stats(self) -> Stats:
+        return {
+            "fitness_evaluations": self.evaluations,
+            "fitness_delta_evaluations": self.delta_evaluations,
+            "fitness_cache_hits": self.cache_hits,
+            "evaluations_avoided": self.delta_evaluations + self.cache_hits,
+        }
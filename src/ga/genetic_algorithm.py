@@ -1,14 +1,28 @@
 import random
+from typing import Literal
 
 from src.ga.crossover import CrossoverFunc
+from src.ga.evaluation import FitnessEvaluator
+from src.ga.memetic import LocalSearch, greedy_seeds
 from src.ga.mutation import MutationFunc
 from src.ga.q import QFunc
 from src.ga.reproduction import ReproducitionFunc
 from src.ga.succession import SuccesionFunc
 from src.ga.type_definitions import Board, Population
-from src.ga.unit import Unit
+from src.ga.unit import Unit, ValueRepair
+from src.util.stopping import StoppingCriterion
 from src.util.time_measure import measure_time
-from src.util.types import MWISResult
+from src.util.types import LogStatsResult, Stats
+
+# "random" drops random cells over the card limit, "value" the lowest-value ones and
+# "value-refill" then also fills free cards with the best compatible cells
+type RepairMode = Literal["random", "value", "value-refill"]
+
+
+def get_value_repair(board: Board, repair: RepairMode) -> ValueRepair | None:
+    if repair == "random":
+        return None
+    return ValueRepair(board, refill=repair == "value-refill")
 
 
 class GeneticAlgorithm:
@@ -22,11 +36,16 @@ class GeneticAlgorithm:
         population_count: int,
         probability_of_mutation: float,
         probability_of_crossover: float,
-        fes: int,
+        fes: int | None,
         num_of_cards: int,
         board: Board,
         num_of_best_survivors: int = 0,
         starting_population: Population | None = None,
+        deadline: float | None = None,
+        patience: int | None = None,
+        target: float | None = None,
+        repair: RepairMode = "random",
+        local_search: LocalSearch | None = None,
     ):
         self._q = q
         self._mutation = mutation
@@ -36,11 +55,17 @@ class GeneticAlgorithm:
         self.population_count = population_count
         self.probability_of_mutation = probability_of_mutation
         self.probability_of_crossover = probability_of_crossover
-        self.t_max = fes // population_count
+        self.t_max = None if fes is None else fes // population_count
         self.t = 0
+        self.deadline = deadline
+        self.patience = patience
+        self.target = target
         self.board = board
         self.num_of_cards = num_of_cards
         self.num_of_best_survivors = num_of_best_survivors
+        self.evaluator = FitnessEvaluator(q, board)
+        self.local_search = local_search
+        self.value_repair = get_value_repair(board, repair)
         self.population = (
             starting_population if starting_population else self._generate_starting_population()
         )
@@ -48,12 +73,15 @@ class GeneticAlgorithm:
         self.best_unit, self.best_value = self._find_best_unit(self.population, self.evaluation)
 
     def _generate_starting_population(self) -> Population:
-        return [Unit(len(self.board), self.num_of_cards) for _ in range(self.population_count)]
+        return [
+            Unit(len(self.board), self.num_of_cards, value_repair=self.value_repair)
+            for _ in range(self.population_count)
+        ]
 
     def _get_population_evaluation(self, population: Population) -> dict[Unit, int]:
         evaluation: dict[Unit, int] = {}
         for u in population:
-            evaluation[u] = self._q(u, self.board)
+            evaluation[u] = self.evaluator(u)
         return evaluation
 
     def _find_best_unit(
@@ -69,7 +97,7 @@ class GeneticAlgorithm:
         return best_unit, best_value
 
     def _stop(self) -> bool:
-        return self.t >= self.t_max
+        return self.stopping.should_stop()
 
     def reproduction(self) -> None:
         self.r_population = self._reproduction(
@@ -94,13 +122,16 @@ class GeneticAlgorithm:
         )
 
     @measure_time()
-    def run(self) -> MWISResult:
-        log_values: list[int] = [self.best_value]
+    def run(self) -> LogStatsResult:
+        self.stopping = StoppingCriterion(self.t_max, self.deadline, self.patience, self.target)
+        self.stopping.update(self.best_value)
         while not self._stop():
             self.reproduction()
             self.crossover()
             self.mutation()
             self.m_evaluation = self._get_population_evaluation(self.m_population)
+            if self.local_search is not None:
+                self.local_search(self.m_population, self.m_evaluation)
             best_candidate, best_candidate_evaluation = self._find_best_unit(
                 self.m_population, self.m_evaluation
             )
@@ -108,11 +139,18 @@ class GeneticAlgorithm:
                 self.best_unit = best_candidate
                 self.best_value = best_candidate_evaluation
                 # print(self.best_value)
-            log_values.append(self.best_value)
+            self.stopping.update(self.best_value)
             self.succession()
             self.t += 1
-        log = ([i for i in range(len(log_values))], log_values)
-        return self.best_value, self.best_unit.genes, log
+        return self.best_value, self.best_unit.genes, self.stopping.log, self.stats()
+
+    def stats(self) -> Stats:
+        stats = self.evaluator.stats()
+        if self.local_search is None:
+            stats.update(LocalSearch.empty_stats())
+        else:
+            stats.update(self.local_search.stats())
+        return stats
 
 
 def run_genetic_algorithm(
@@ -127,13 +165,44 @@ def run_genetic_algorithm(
     population_count: int,
     probability_of_mutation: float,
     probability_of_crossover: float,
-    fes: int,
+    fes: int | None,
     num_of_best_survivors: int = 0,
     starting_population: Population | None = None,
     rng: random.Random | None = None,
-) -> MWISResult:
+    deadline: float | None = None,
+    patience: int | None = None,
+    target: float | None = None,
+    repair: RepairMode = "random",
+    memetic: bool = False,
+    seed_perturbation: float = 0.2,
+    local_search_top_k: int = 0,
+    local_search_steps: int = 5,
+    local_search_region_percent_size: float = 0.05,
+) -> tuple[LogStatsResult, float]:
+    """With `memetic`, seeds the population greedily and adds local search to offspring."""
     if rng is not None:
         random.seed(rng.getrandbits(64))
+    local_search = None
+    seeding_time = 0.0
+    if memetic:
+        if not starting_population:
+            starting_population, seeding_time = greedy_seeds(
+                board,
+                num_of_cards,
+                population_count,
+                seed_perturbation,
+                get_value_repair(board, repair),
+            )
+        if local_search_top_k > 0:
+            local_search = LocalSearch(
+                board,
+                local_search_top_k,
+                local_search_steps,
+                local_search_region_percent_size,
+                random.Random(random.getrandbits(64)),
+            )
+        if deadline is not None:
+            deadline = max(deadline - seeding_time, 0.0)
     ga = GeneticAlgorithm(
         q,
         mutation,
@@ -148,5 +217,12 @@ def run_genetic_algorithm(
         board,
         num_of_best_survivors,
         starting_population,
+        deadline,
+        patience,
+        target,
+        repair,
+        local_search,
     )
-    return ga.run()
+    (value, genes, log, stats), elapsed = ga.run()
+    stats["seeding_time"] = seeding_time
+    return (value, genes, log, stats), elapsed + seeding_time
@@ -0,0 +1,212 @@
+import multiprocessing as mp
+import queue
+import random
+from multiprocessing.queues import Queue
+from typing import Any, Literal
+
+import numpy as np
+
+from src.dp.presolve import combine_extras
+from src.ga.crossover import CrossoverFunc
+from src.ga.genetic_algorithm import GeneticAlgorithm, RepairMode
+from src.ga.mutation import MutationFunc
+from src.ga.q import QFunc
+from src.ga.reproduction import ReproducitionFunc
+from src.ga.succession import SuccesionFunc
+from src.ga.type_definitions import Board
+from src.ga.unit import Genes, Unit
+from src.util.stopping import pad_to_longest
+from src.util.time_measure import measure_time
+from src.util.types import Log, LogStatsResult, Stats
+
+POLL_INTERVAL = 0.05
+
+type Topology = Literal["ring", "random"]
+# (island, best value, best genes, log, stats)
+type IslandResult = tuple[int, int, Genes, Log, Stats]
+type Inbox = Queue[list[Genes]]
+
+
+class MigratingGeneticAlgorithm(GeneticAlgorithm):
+    """`GeneticAlgorithm` of one island, exchanging its best units every `migration_interval`."""
+
+    def __init__(
+        self,
+        *args: Any,
+        island: int,
+        inboxes: list[Inbox],
+        topology: Topology,
+        migration_interval: int,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.island = island
+        self.inboxes = inboxes
+        self.topology = topology
+        self.migration_interval = migration_interval
+        self.n_migrants = max(self.num_of_best_survivors, 1)
+        self.migrations = 0
+
+    def succession(self) -> None:
+        super().succession()
+        if len(self.inboxes) > 1 and (self.t + 1) % self.migration_interval == 0:
+            self._emigrate()
+            self._immigrate()
+
+    def _emigrate(self) -> None:
+        if self.topology == "ring":
+            target = (self.island + 1) % len(self.inboxes)
+        else:
+            target = random.choice([i for i in range(len(self.inboxes)) if i != self.island])
+        best = sorted(self.population, key=lambda unit: self.evaluation[unit])[-self.n_migrants :]
+        self.inboxes[target].put([unit.genes[:] for unit in best])
+        self.migrations += 1
+
+    def _immigrate(self) -> None:
+        migrants: list[Genes] = []
+        try:
+            while True:
+                migrants.extend(self.inboxes[self.island].get_nowait())
+        except queue.Empty:
+            pass
+        if not migrants:
+            return
+        migrants = migrants[-len(self.population) :]
+        self.population.sort(key=lambda unit: self.evaluation[unit])
+        for unit in self.population[: len(migrants)]:
+            del self.evaluation[unit]
+        immigrants = [
+            Unit(len(genes), self.num_of_cards, genes, self.value_repair) for genes in migrants
+        ]
+        self.population[: len(migrants)] = immigrants
+        for unit in immigrants:
+            self.evaluation[unit] = self.evaluator(unit)
+        best_unit, best_value = self._find_best_unit(immigrants, self.evaluation)
+        if best_value > self.best_value:
+            self.best_unit, self.best_value = best_unit, best_value
+
+
+def _island_worker(
+    island: int,
+    seed: int,
+    inboxes: list[Inbox],
+    results: Queue[IslandResult],
+    ga_args: tuple[Any, ...],
+    ga_kwargs: dict[str, Any],
+) -> None:
+    random.seed(seed)
+    # Migrants left unread by islands that already stopped must not block this one on exit.
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+    ga = MigratingGeneticAlgorithm(*ga_args, island=island, inboxes=inboxes, **ga_kwargs)
+    (value, genes, log, stats), _ = ga.run()
+    results.put((island, value, genes, log, {**stats, "migrations": ga.migrations}))
+
+
+class IslandModel:
+    """Runs `n_islands` GAs in separate processes; per-island logs are in the stats."""
+
+    def __init__(
+        self,
+        n_islands: int,
+        migration_interval: int,
+        topology: Topology,
+        seed: int,
+        ga_args: tuple[Any, ...],
+        ga_kwargs: dict[str, Any],
+    ) -> None:
+        self.n_islands = n_islands
+        self.migration_interval = migration_interval
+        self.topology = topology
+        self.seed = seed
+        self.ga_args = ga_args
+        self.ga_kwargs = ga_kwargs
+
+    @measure_time()
+    def run(self) -> LogStatsResult:
+        inboxes: list[Inbox] = [mp.Queue() for _ in range(self.n_islands)]
+        results: Queue[IslandResult] = mp.Queue()
+        kwargs = {
+            **self.ga_kwargs,
+            "topology": self.topology,
+            "migration_interval": self.migration_interval,
+        }
+        processes = [
+            mp.Process(
+                target=_island_worker,
+                args=(island, self.seed + island, inboxes, results, self.ga_args, kwargs),
+                daemon=True,
+            )
+            for island in range(self.n_islands)
+        ]
+        for process in processes:
+            process.start()
+        island_results: list[IslandResult] = []
+        try:
+            while len(island_results) < self.n_islands:
+                try:
+                    island_results.append(results.get(timeout=POLL_INTERVAL))
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        raise RuntimeError("An island exited without a result")
+        finally:
+            for process in processes:
+                process.join(timeout=POLL_INTERVAL)
+                process.terminate()
+        island_results.sort()
+
+        island_logs = [log for _, _, _, log, _ in island_results]
+        _, value, genes, _, _ = max(island_results, key=lambda result: result[1])
+        iterations = max((log[0] for log in island_logs), key=len)
+        values = np.max(pad_to_longest([log[1] for log in island_logs]), axis=0)
+        timestamps = np.max(pad_to_longest([log[2] for log in island_logs]), axis=0)
+        island_values = [result[1] for result in island_results]
+        stats = combine_extras([result[4] for result in island_results])
+        stats["island_value_min"] = min(island_values)
+        stats["island_value_max"] = max(island_values)
+        stats["island_logs"] = island_logs
+        return value, genes, (iterations, values.tolist(), timestamps.tolist()), stats
+
+
+def run_island_genetic_algorithm(
+    board: Board,
+    num_of_cards: int,
+    *,
+    q: QFunc,
+    mutation: MutationFunc,
+    reproduction: ReproducitionFunc,
+    crossover: CrossoverFunc,
+    succession: SuccesionFunc,
+    population_count: int,
+    probability_of_mutation: float,
+    probability_of_crossover: float,
+    fes: int | None,
+    num_of_best_survivors: int = 0,
+    n_islands: int = 4,
+    migration_interval: int = 10,
+    topology: Topology = "ring",
+    rng: random.Random | None = None,
+    deadline: float | None = None,
+    patience: int | None = None,
+    target: float | None = None,
+    repair: RepairMode = "random",
+) -> tuple[LogStatsResult, float]:
+    """Splits `population_count` and `fes` evenly among `n_islands` processes."""
+    ga_args = (
+        q,
+        mutation,
+        reproduction,
+        crossover,
+        succession,
+        max(population_count // n_islands, 2),
+        probability_of_mutation,
+        probability_of_crossover,
+        None if fes is None else fes // n_islands,
+        num_of_cards,
+        board,
+        num_of_best_survivors,
+    )
+    ga_kwargs = {"deadline": deadline, "patience": patience, "target": target, "repair": repair}
+    seed = (rng or random.Random()).getrandbits(32)
+    model = IslandModel(n_islands, migration_interval, topology, seed, ga_args, ga_kwargs)
+    return model.run()
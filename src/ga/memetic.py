@@ -0,0 +1,116 @@
+import random
+import time
+
+from src.ga.type_definitions import Board, Population
+from src.ga.unit import Genes, Unit, ValueRepair
+from src.greedy.board_state import BoardState, Tile
+from src.greedy.greedy_fill import greedy_fill
+from src.greedy.successor_generator import FixLocalRegions
+from src.greedy.window_cache import EMPTY_CACHE_STATS
+from src.util.time_measure import measure_time
+from src.util.types import Stats
+
+# Genes keep column j in bit j, BoardState masks in bit 3 - j.
+REVERSED_MASKS = [int(f"{mask:04b}"[::-1], 2) for mask in range(16)]
+
+
+def _to_state(board: Board, genes: Genes) -> BoardState:
+    state = BoardState(board)
+    for row, gene in enumerate(genes):
+        state.set_row_mask(row, REVERSED_MASKS[gene])
+    return state
+
+
+def _to_genes(state: BoardState) -> Genes:
+    return [REVERSED_MASKS[mask] for mask in state.masks]
+
+
+@measure_time()
+def greedy_seeds(
+    board: Board,
+    num_of_cards: int,
+    population_count: int,
+    perturbation: float,
+    value_repair: ValueRepair | None = None,
+) -> Population:
+    """Greedy fills of the board by randomly perturbed cell values, the first unperturbed."""
+    population: Population = []
+    for i in range(population_count):
+        noise = [
+            [1.0 if i == 0 else random.uniform(1 - perturbation, 1 + perturbation) for _ in row]
+            for row in board
+        ]
+
+        def perturbed_weight(
+            state: BoardState, tile: Tile, noise: list[list[float]] = noise
+        ) -> float:
+            row, col = tile
+            return state.board[row][col] * noise[row][col]
+
+        state = BoardState(board)
+        greedy_fill(state, num_of_cards, perturbed_weight)
+        population.append(Unit.from_valid_genes(_to_genes(state), num_of_cards, value_repair))
+    return population
+
+
+class LocalSearch:
+    """Applies `steps` windowed-DP repairs to the `top_k` best offspring of each generation."""
+
+    def __init__(
+        self, board: Board, top_k: int, steps: int, region_percent_size: float, rng: random.Random
+    ) -> None:
+        self.board = board
+        self.top_k = top_k
+        self.steps = steps
+        self.generator = FixLocalRegions(max(int(region_percent_size * len(board)), 2), rng)
+        self.time = 0.0
+        self.repairs = 0
+        self.improved = 0
+        self.gain = 0
+
+    def __call__(self, population: Population, evaluation: dict[Unit, int]) -> None:
+        start = time.perf_counter()
+        best = sorted(range(len(population)), key=lambda i: evaluation[population[i]])
+        seen: set[int] = set()
+        for i in reversed(best):
+            if len(seen) == self.top_k:
+                break
+            unit = population[i]
+            if id(unit) in seen:
+                continue
+            seen.add(id(unit))
+            state = _to_state(self.board, unit.genes)
+            for _ in range(self.steps):
+                state = self.generator(state, unit.num_of_cards)
+            self.repairs += self.steps
+            value = state.evaluate_sum()
+            if value <= evaluation[unit]:
+                continue
+            improved = Unit.from_valid_genes(
+                _to_genes(state), unit.num_of_cards, unit.value_repair, value
+            )
+            self.gain += value - evaluation[unit]
+            self.improved += 1
+            population[population.index(unit)] = improved
+            evaluation[improved] = value
+        self.time += time.perf_counter() - start
+
+    def stats(self) -> Stats:
+        return {
+            "local_search_time": self.time,
+            "local_search_repairs": self.repairs,
+            "local_search_improved": self.improved,
+            "local_search_gain": self.gain,
+            **{f"local_search_{key}": value for key, value in self.generator.stats().items()},
+        }
+
+    @staticmethod
+    def empty_stats() -> Stats:
+        """The keys of `stats` with zeros, for runs without local search."""
+        return {
+            "local_search_time": 0.0,
+            "local_search_repairs": 0,
+            "local_search_improved": 0,
+            "local_search_gain": 0,
+            **{f"local_search_{key}": value for key, value in EMPTY_CACHE_STATS.items()},
+        }
@@ -0,0 +1,124 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from src.ga.type_definitions import Board
+from src.util.mask_tables import IntArray, get_board_array
+from src.util.util import generate_non_adjacent_masks
+
+# One individual per row, one gene (column mask, bit j for board column j as in `q`) per board row
+type PopulationArray = NDArray[np.uint8]
+
+GENES = np.array(generate_non_adjacent_masks(4), dtype=np.uint8)
+
+
+def get_gene_values(board: Board) -> IntArray:
+    """`values[row, gene]` is the sum of the cells of `row` selected by `gene`."""
+    values = get_board_array(board)
+    n_columns: int = values.shape[1]
+    bits = (np.arange(1 << n_columns)[:, None] >> np.arange(n_columns)[None, :]) & 1
+    return values @ bits.T
+
+
+def evaluate(population: PopulationArray, gene_values: IntArray) -> IntArray:
+    return gene_values[np.arange(population.shape[1]), population].sum(axis=1)
+
+
+def random_population(
+    population_count: int, n_rows: int, num_of_cards: int, rng: np.random.Generator
+) -> PopulationArray:
+    return repair(rng.choice(GENES, (population_count, n_rows)), num_of_cards, rng)
+
+
+def tournament(
+    population: PopulationArray, fitness: IntArray, population_count: int, rng: np.random.Generator
+) -> PopulationArray:
+    first, second = rng.integers(len(population), size=(2, population_count))
+    return population[np.where(fitness[first] >= fitness[second], first, second)]
+
+
+def two_point_crossover(
+    population: PopulationArray,
+    probability_of_crossover: float,
+    population_count: int,
+    num_of_cards: int,
+    rng: np.random.Generator,
+) -> PopulationArray:
+    """Pairs random parents and swaps the genes between two cut points of crossed pairs."""
+    n_pairs = -(-population_count // 2)
+    n_rows: int = population.shape[1]
+    parents = population[rng.integers(len(population), size=(2, n_pairs))]
+    if n_rows < 2:
+        return parents.reshape(-1, n_rows)[:population_count]
+    cuts = np.sort(rng.integers(1, n_rows, size=(n_pairs, 2)), axis=1)
+    if n_rows > 2:
+        # Two distinct cut points, uniform over all pairs as in `Unit.cross`
+        equal = cuts[:, 0] == cuts[:, 1]
+        while equal.any():
+            cuts[equal] = np.sort(rng.integers(1, n_rows, size=(equal.sum(), 2)), axis=1)
+            equal = cuts[:, 0] == cuts[:, 1]
+    else:
+        cuts[:, 1] = n_rows
+    rows = np.arange(n_rows)
+    swapped = (rows >= cuts[:, :1]) & (rows < cuts[:, 1:])
+    swapped &= (rng.random(n_pairs) < probability_of_crossover)[:, None]
+    first: PopulationArray = parents[0]
+    second: PopulationArray = parents[1]
+    children = np.stack([np.where(swapped, second, first), np.where(swapped, first, second)])
+    crossed = swapped.any(axis=1)
+    children[:, crossed] = repair(
+        children[:, crossed].reshape(-1, n_rows), num_of_cards, rng
+    ).reshape(2, -1, n_rows)
+    return children.transpose(1, 0, 2).reshape(-1, n_rows)[:population_count]
+
+
+def mutate(
+    population: PopulationArray,
+    probability_of_mutation: float,
+    num_of_cards: int,
+    rng: np.random.Generator,
+) -> PopulationArray:
+    mutated = rng.random(population.shape) < probability_of_mutation
+    population = np.where(mutated, rng.choice(GENES, population.shape), population)
+    changed = mutated.any(axis=1)
+    population[changed] = repair(population[changed], num_of_cards, rng)
+    return population
+
+
+def repair(
+    population: PopulationArray, num_of_cards: int, rng: np.random.Generator
+) -> PopulationArray:
+    """Clears vertical conflicts, then drops uniformly random cells down to `num_of_cards`."""
+    population = population.copy()
+    n_units, n_rows = population.shape
+    for row in range(1, n_rows):
+        population[:, row] &= ~population[:, row - 1]
+    bits = np.unpackbits(population[..., None], axis=-1, bitorder="little")[..., :4]
+    cells = bits.reshape(n_units, 4 * n_rows).astype(bool)
+    excess = cells.sum(axis=1) - num_of_cards
+    over = excess > 0
+    if over.any():
+        # The `excess` selected cells with the smallest random keys are dropped
+        keys = np.where(cells[over], rng.random(cells[over].shape), np.inf)
+        ranks = keys.argsort(axis=1).argsort(axis=1)
+        cells[over] &= ranks >= excess[over, None]
+        bits = cells.reshape(bits.shape).astype(np.uint8)
+        population = (bits << np.arange(4, dtype=np.uint8)).sum(axis=-1, dtype=np.uint8)
+    return population
+
+
+def elitism(
+    m_population: PopulationArray,
+    m_fitness: IntArray,
+    old_population: PopulationArray,
+    old_fitness: IntArray,
+    num_of_best_survivors: int,
+) -> tuple[PopulationArray, IntArray]:
+    """The best `num_of_best_survivors` old individuals replace the worst new ones."""
+    if num_of_best_survivors <= 0:
+        return m_population, m_fitness
+    survivors = np.argsort(old_fitness, kind="stable")[-num_of_best_survivors:]
+    kept = np.argsort(m_fitness, kind="stable")[num_of_best_survivors:]
+    return (
+        np.concatenate([m_population[kept], old_population[survivors]]),
+        np.concatenate([m_fitness[kept], old_fitness[survivors]]),
+    )
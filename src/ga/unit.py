@@ -1,28 +1,197 @@
-from itertools import combinations
-from random import choice, uniform
+import math
+from dataclasses import dataclass
+from heapq import heapify, heappop
+from random import choice, random, randrange, sample
+from typing import ClassVar
 
+from src.util.types import Board
 from src.util.util import generate_non_adjacent_masks
 
 type Genes = list[int]
 
 
+@dataclass(frozen=True)
+class ValueRepair:
+    """Repair by cell value: drops the lowest cells and, with `refill`, adds the best free ones."""
+
+    board: Board
+    refill: bool = False
+
+
 class Unit:
-    def __init__(self, num_of_columns: int, num_of_cards: int, genes: Genes | None = None) -> None:
-        self.choices = generate_non_adjacent_masks(4)
+    """Column masks of one individual, with the ancestry `FitnessEvaluator` needs for deltas."""
+
+    __slots__ = (
+        "genes",
+        "num_of_cards",
+        "cards",
+        "fitness",
+        "prefix",
+        "parent",
+        "donor",
+        "cuts",
+        "changes",
+        "value_repair",
+    )
+
+    choices: ClassVar[list[int]] = generate_non_adjacent_masks(4)
+
+    def __init__(
+        self,
+        num_of_columns: int,
+        num_of_cards: int,
+        genes: Genes | None = None,
+        value_repair: ValueRepair | None = None,
+    ) -> None:
         self.genes = [choice(self.choices) for _ in range(num_of_columns)] if not genes else genes
         self.num_of_cards = num_of_cards
+        self.value_repair = value_repair
+        self.fitness: int | None = None
+        self.prefix: list[int] | None = None
+        self.parent: Unit | None = None
+        self.donor: Unit | None = None
+        self.cuts: tuple[int, int] | None = None
+        self.changes: dict[int, int] | None = None
         self.repair()
 
+    @classmethod
+    def from_valid_genes(
+        cls,
+        genes: Genes,
+        num_of_cards: int,
+        value_repair: ValueRepair | None = None,
+        fitness: int | None = None,
+    ) -> "Unit":
+        """Wraps genes already known to be valid, skipping the repair."""
+        unit = cls.__new__(cls)
+        unit.genes = genes
+        unit.num_of_cards = num_of_cards
+        unit.cards = sum(map(int.bit_count, genes))
+        unit.fitness = fitness
+        unit.prefix = None
+        unit.parent = unit.donor = None
+        unit.cuts = None
+        unit.changes = None
+        unit.value_repair = value_repair
+        return unit
+
+    @classmethod
+    def _offspring(
+        cls,
+        genes: Genes,
+        num_of_cards: int,
+        cards: int,
+        changed_rows: list[int],
+        parent: "Unit",
+        changes: dict[int, int],
+        donor: "Unit | None" = None,
+        cuts: tuple[int, int] | None = None,
+    ) -> "Unit":
+        """Repairs genes of valid parents that differ only at the sorted `changed_rows`."""
+        unit = cls.__new__(cls)
+        unit.genes = genes
+        unit.num_of_cards = num_of_cards
+        unit.cards = cards
+        unit.fitness = None
+        unit.prefix = None
+        unit.parent = parent
+        unit.donor = donor
+        unit.cuts = cuts
+        unit.changes = changes
+        unit.value_repair = parent.value_repair
+        unit._repair_rows(changed_rows)
+        if unit.value_repair is None:
+            unit._remove_excess_cards()
+        else:
+            unit._repair_by_value(unit.value_repair, {*changed_rows, *changes})
+        return unit
+
     def repair(self) -> None:
         for i in range(1, len(self.genes)):
             self.genes[i] &= ~self.genes[i - 1]
-        num_of_cards_used = sum(x.bit_count() for x in self.genes)
-        while num_of_cards_used > self.num_of_cards:
-            column = choice([i for i, g in enumerate(self.genes) if g != 0])
-            ones = [bit for bit in range(4) if (self.genes[column] >> bit) & 1]
-            bit_to_remove = choice(ones)
-            self.genes[column] &= ~(1 << bit_to_remove)
-            num_of_cards_used -= 1
+        self.cards = sum(map(int.bit_count, self.genes))
+        if self.value_repair is None:
+            self._remove_excess_cards()
+        else:
+            self._repair_by_value(self.value_repair, None)
+
+    def _repair_rows(self, rows: list[int]) -> None:
+        """Clears conflicts between each of `rows` and the row above, in order."""
+        genes = self.genes
+        for i in rows:
+            if 0 < i < len(genes) and genes[i] & genes[i - 1]:
+                if self.changes is not None:
+                    self.changes.setdefault(i, genes[i])
+                self.cards -= (genes[i] & genes[i - 1]).bit_count()
+                genes[i] &= ~genes[i - 1]
+
+    def _remove_excess_cards(self) -> None:
+        """Drops random selected cells (random gene, then random cell) until the limit holds."""
+        if self.cards <= self.num_of_cards:
+            return
+        genes = self.genes
+        nonzero = [i for i, g in enumerate(genes) if g != 0]
+        while self.cards > self.num_of_cards:
+            position = randrange(len(nonzero))
+            column = nonzero[position]
+            ones = [bit for bit in range(4) if (genes[column] >> bit) & 1]
+            if self.changes is not None:
+                self.changes.setdefault(column, genes[column])
+            genes[column] &= ~(1 << choice(ones))
+            self.cards -= 1
+            if genes[column] == 0:
+                nonzero[position] = nonzero[-1]
+                nonzero.pop()
+
+    def _set_gene(self, row: int, gene: int) -> None:
+        if self.changes is not None:
+            self.changes.setdefault(row, self.genes[row])
+        self.cards += gene.bit_count() - self.genes[row].bit_count()
+        self.genes[row] = gene
+
+    def _repair_by_value(self, value_repair: ValueRepair, touched: set[int] | None) -> None:
+        """Drops the lowest-value cells, then optionally refills around the `touched` rows."""
+        genes, board = self.genes, value_repair.board
+        if self.cards > self.num_of_cards:
+            cells = [
+                (board[row][col], row, col)
+                for row, gene in enumerate(genes)
+                if gene
+                for col in range(4)
+                if gene >> col & 1
+            ]
+            heapify(cells)
+            while self.cards > self.num_of_cards:
+                _, row, col = heappop(cells)
+                self._set_gene(row, genes[row] & ~(1 << col))
+                if touched is not None:
+                    touched.add(row)
+        if value_repair.refill and self.cards < self.num_of_cards:
+            n_rows = len(genes)
+            if touched is None:
+                rows: set[int] | range = range(n_rows)
+            else:
+                rows = {r for row in touched for r in (row - 1, row, row + 1) if 0 <= r < n_rows}
+            candidates = sorted(
+                (
+                    (board[row][col], row, col)
+                    for row in rows
+                    for col in range(4)
+                    if board[row][col] > 0
+                ),
+                reverse=True,
+            )
+            for _, row, col in candidates:
+                if self.cards >= self.num_of_cards:
+                    break
+                bit = 1 << col
+                if genes[row] & (bit | bit << 1 | bit >> 1):
+                    continue
+                if row > 0 and genes[row - 1] & bit:
+                    continue
+                if row + 1 < n_rows and genes[row + 1] & bit:
+                    continue
+                self._set_gene(row, genes[row] | bit)
 
     def __str__(self) -> str:
         return str(self.genes)
@@ -32,29 +201,58 @@ class Unit:
 
     def cross(self, other: "Unit") -> tuple["Unit", "Unit"]:
         num_genes = len(self.genes)
-        if num_genes <= 2:
-            k = 1
+        if num_genes < 2:
+            return (
+                Unit._offspring(self.genes[:], self.num_of_cards, self.cards, [], self, {}),
+                Unit._offspring(other.genes[:], self.num_of_cards, other.cards, [], other, {}),
+            )
+        if num_genes == 2:
+            p1, p2 = 1, num_genes
         else:
-            k = 2
+            p1, p2 = sorted(sample(range(1, num_genes), 2))
 
-        points = choice(list(combinations(range(1, num_genes), k)))
+        a, b = self.genes, other.genes
+        a_segment = sum(map(int.bit_count, a[p1:p2]))
+        b_segment = sum(map(int.bit_count, b[p1:p2]))
 
-        def build_child(a: list[int], b: list[int], points: tuple[int, ...]) -> "Unit":
-            if len(points) == 1:
-                p = points[0]
-                return Unit(num_genes, self.num_of_cards, a[:p] + b[p:])
-            else:
-                p1, p2 = points
-                return Unit(num_genes, self.num_of_cards, a[:p1] + b[p1:p2] + a[p2:])
+        def build_child(parent: Unit, donor: Unit, cards: int) -> "Unit":
+            a, b = parent.genes, donor.genes
+            genes = a[:p1] + b[p1:p2] + a[p2:]
+            return Unit._offspring(
+                genes, self.num_of_cards, cards, [p1, p2], parent, {}, donor, (p1, p2)
+            )
 
-        child1 = build_child(self.genes, other.genes, points)
-        child2 = build_child(other.genes, self.genes, points)
+        child1 = build_child(self, other, self.cards - a_segment + b_segment)
+        child2 = build_child(other, self, other.cards - b_segment + a_segment)
 
         return child1, child2
 
     def mutate(self, probability_of_mutation: float) -> "Unit":
-        new_genes = [x for x in self.genes]
-        for i in range(len(self.genes)):
-            if uniform(0, 1) < probability_of_mutation:
-                new_genes[i] = choice(self.choices)
-        return Unit(len(self.genes), self.num_of_cards, new_genes)
+        new_genes = self.genes[:]
+        cards = self.cards
+        changed: list[int] = []
+        changes: dict[int, int] = {}
+        for i in _mutation_points(len(new_genes), probability_of_mutation):
+            gene = choice(self.choices)
+            changes.setdefault(i, new_genes[i])
+            cards += gene.bit_count() - new_genes[i].bit_count()
+            new_genes[i] = gene
+            changed.extend((i, i + 1))
+        return Unit._offspring(
+            new_genes, self.num_of_cards, cards, sorted(set(changed)), self, changes
+        )
+
+
+def _mutation_points(num_genes: int, probability: float) -> list[int]:
+    """Indices hit by independent mutations, drawn by geometric skips between hits."""
+    if probability <= 0:
+        return []
+    if probability >= 1:
+        return list(range(num_genes))
+    points: list[int] = []
+    log_q = math.log(1 - probability)
+    i = int(math.log(1 - random()) / log_q)
+    while i < num_genes:
+        points.append(i)
+        i += 1 + int(math.log(1 - random()) / log_q)
+    return points
@@ -1,25 +1,24 @@
+from array import array
+
 from src.util.types import Board
+from src.util.util import calculate_row_sum
 
 type Tile = tuple[int, int]
 
 
 class BoardState:
+    """Selection as one mask per row (bit `m - 1 - col`), with its value and card count."""
+
     def __init__(self, board: Board) -> None:
         self.n: int = len(board)
         self.m: int = len(board[0])
         self.board: Board = board
-        self.selection_grid: list[list[bool]] = [
-            [False for _ in range(self.m)] for _ in range(self.n)
-        ]
-        self.selected_tiles: set[Tile] = set()
+        self.masks = array("B", bytes(self.n))
+        self.value = 0
+        self.cards = 0
 
     def evaluate_sum(self) -> int:
-        return sum(
-            self.board[i][j]
-            for j in range(self.m)
-            for i in range(self.n)
-            if self.selection_grid[i][j]
-        )
+        return self.value
 
     def neighbors(self, tile: Tile) -> list[Tile]:
         row, col = tile
@@ -31,33 +30,54 @@ class BoardState:
                 result.append((new_row, new_col))
         return result
 
+    def _bit(self, col: int) -> int:
+        return 1 << (self.m - 1 - col)
+
+    def is_selected(self, tile: Tile) -> bool:
+        row, col = tile
+        return bool(self.masks[row] & self._bit(col))
+
     def can_tile_be_selected(self, tile: Tile) -> bool:
         row, col = tile
-        neighbors = self.neighbors(tile)
-        return (
-            not any(self.selection_grid[i][j] for i, j in neighbors)
-            and not self.selection_grid[row][col]
-        )
+        bit = self._bit(col)
+        if self.masks[row] & (bit | bit << 1 | bit >> 1):
+            return False
+        if row > 0 and self.masks[row - 1] & bit:
+            return False
+        return not (row + 1 < self.n and self.masks[row + 1] & bit)
 
     def select_tile(self, tile: Tile) -> None:
+        """Does nothing if the tile is already selected."""
         row, col = tile
-        self.selection_grid[row][col] = True
-        self.selected_tiles.add(tile)
+        bit = self._bit(col)
+        if self.masks[row] & bit:
+            return
+        self.masks[row] |= bit
+        self.value += self.board[row][col]
+        self.cards += 1
 
     def unselect_tile(self, tile: Tile) -> None:
+        """Does nothing if the tile is not selected."""
         row, col = tile
-        self.selection_grid[row][col] = False
-        self.selected_tiles.remove(tile)
+        bit = self._bit(col)
+        if not self.masks[row] & bit:
+            return
+        self.masks[row] &= ~bit
+        self.value -= self.board[row][col]
+        self.cards -= 1
+
+    def set_row_mask(self, row_index: int, mask: int) -> None:
+        old_mask = self.masks[row_index]
+        row = self.board[row_index]
+        self.value += calculate_row_sum(row, mask) - calculate_row_sum(row, old_mask)
+        self.cards += mask.bit_count() - old_mask.bit_count()
+        self.masks[row_index] = mask
 
     def count_selected_tiles(self) -> int:
-        return len(self.selected_tiles)
+        return self.cards
 
     def get_mask_from_row(self, row_index: int) -> int:
-        mask = 0
-        selection_row = self.selection_grid[row_index]
-        for tile in selection_row:
-            mask = (mask << 1) | int(tile)
-        return mask
+        return self.masks[row_index]
 
     def convert_state_to_masks(self) -> list[int]:
-        return [self.get_mask_from_row(i) for i in range(self.n)]
+        return self.masks.tolist()
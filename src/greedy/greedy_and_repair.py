@@ -1,10 +1,19 @@
 import random
+from typing import Callable, Literal
 
 from src.greedy.board_state import BoardState
 from src.greedy.greedy_fill import greedy_fill, weight
-from src.greedy.successor_generator import FixLocalRegions
+from src.greedy.successor_generator import (
+    FixDisjointRegions,
+    FixLocalRegions,
+    GainGuidedRegions,
+    SuccessorGenerator,
+)
+from src.util.stopping import StoppingCriterion
 from src.util.time_measure import measure_time
-from src.util.types import Board, MWISResult
+from src.util.types import Board, LogStatsResult
+
+type WindowSelection = Literal["random", "gain"]
 
 
 @measure_time()
@@ -12,18 +21,37 @@ def greedy_and_repair(
     board: Board,
     max_cards: int,
     *,
-    n_iter: int = 200,
+    n_iter: int | None = 200,
+    deadline: float | None = None,
+    patience: int | None = None,
+    target: float | None = None,
     region_percent_size: float = 0.05,
+    windows_per_sweep: int = 1,
+    selection: WindowSelection = "random",
     rng: random.Random,
-) -> MWISResult:
+    on_improvement: Callable[[BoardState], None] | None = None,
+) -> LogStatsResult:
+    """`on_improvement` is called with the state after the greedy fill and every improvement."""
     region_size = max(int(region_percent_size * len(board)), 2)
-    generator = FixLocalRegions(region_size, rng)
+    generator: SuccessorGenerator
+    if windows_per_sweep > 1:
+        generator = FixDisjointRegions(region_size, windows_per_sweep, rng)
+    elif selection == "gain":
+        generator = GainGuidedRegions(region_size, rng)
+    else:
+        generator = FixLocalRegions(region_size, rng)
+    stopping = StoppingCriterion(n_iter, deadline, patience, target)
     state = BoardState(board)
     greedy_fill(state, max_cards, weight)
-    eval = state.evaluate_sum()
-    evals: list[float] = [eval]
-    for _ in range(n_iter):
+    best = state.evaluate_sum()
+    stopping.update(best)
+    if on_improvement is not None:
+        on_improvement(state)
+    while not stopping.should_stop():
         state = generator(state, max_cards)
-        eval = state.evaluate_sum()
-        evals.append(eval)
-    return eval, state.convert_state_to_masks(), ([i for i in range(n_iter + 1)], evals)
+        value = state.evaluate_sum()
+        stopping.update(value)
+        if on_improvement is not None and value > best:
+            best = value
+            on_improvement(state)
+    return state.evaluate_sum(), state.convert_state_to_masks(), stopping.log, generator.stats()
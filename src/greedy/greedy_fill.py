@@ -1,3 +1,4 @@
+from heapq import heappop, heappush
 from typing import Callable
 
 from src.greedy.board_state import BoardState, Tile
@@ -6,26 +7,40 @@ type TileHeuristic = Callable[[BoardState, Tile], int | float]
 
 
 def greedy_fill(state: BoardState, max_cards: int, heuristic: TileHeuristic) -> None:
-    while (tile := _find_best_isolated_tile(state, heuristic)) is not None and len(
-        state.selected_tiles
-    ) < max_cards:
-        state.select_tile(tile)
+    """Selects the best positive-score tile (row-major on ties) until `max_cards` are used."""
+    scores: dict[Tile, int | float] = {}
+    heap: list[tuple[int | float, int, int]] = []
 
+    def push(tile: Tile) -> None:
+        score = heuristic(state, tile)
+        scores[tile] = score
+        if score > 0:
+            heappush(heap, (-score, *tile))
 
-def _find_best_isolated_tile(
-    state: BoardState, heuristic: TileHeuristic
-) -> Tile | None:
-    best_score, best_tile = 0, None
     for i in range(state.n):
         for j in range(state.m):
-            tile = (i, j)
-            if not state.can_tile_be_selected(tile):
-                continue
-            score = heuristic(state, tile)
-            if score > best_score:
-                best_score = score
-                best_tile = tile
-    return best_tile
+            if state.can_tile_be_selected((i, j)):
+                push((i, j))
+
+    while heap and state.count_selected_tiles() < max_cards:
+        neg_score, i, j = heappop(heap)
+        tile = (i, j)
+        if -neg_score != scores[tile] or not state.can_tile_be_selected(tile):
+            continue
+        state.select_tile(tile)
+        for other in _tiles_within_two(state, tile):
+            if state.can_tile_be_selected(other):
+                push(other)
+
+
+def _tiles_within_two(state: BoardState, tile: Tile) -> list[Tile]:
+    row, col = tile
+    return [
+        (i, j)
+        for i in range(max(row - 2, 0), min(row + 3, state.n))
+        for j in range(max(col - 2, 0), min(col + 3, state.m))
+        if 0 < abs(i - row) + abs(j - col) <= 2
+    ]
 
 
 def weight(state: BoardState, tile: Tile) -> int:
@@ -1,9 +1,34 @@
 import random
-from copy import deepcopy
 from dataclasses import dataclass
+from heapq import heappop, heappush
+from typing import Protocol
 
-from src.dp.bottom_up import mwis_bottom_up
-from src.greedy.board_state import BoardState, Tile
+import numpy as np
+
+from src.dp.presolve import allocate_budget
+from src.dp.windows import WindowBatch
+from src.greedy.board_state import BoardState
+from src.greedy.window_cache import EMPTY_CACHE_STATS, BoardTables, WindowCache, window_cache_for
+from src.util.mask_tables import IntArray
+from src.util.types import Board, Stats
+
+
+class SuccessorGenerator(Protocol):
+    def __call__(self, state: BoardState, max_cards: int) -> BoardState: ...
+
+    def stats(self) -> Stats: ...
+
+
+MERGE_GROUP = 64
+GAIN_BATCH = 1024
+WINDOWS_PER_REGION = 4
+
+
+def row_mask_indices(state: BoardState, tables: BoardTables, rows: IntArray) -> IntArray:
+    """Mask index of every row in `rows`; rows -1 and n (outside the board) read as empty."""
+    padded = np.zeros(state.n + 2, dtype=np.int64)
+    padded[1:-1] = np.frombuffer(state.masks, dtype=np.uint8)
+    return tables.mask_index[padded[rows + 1]]
 
 
 @dataclass
@@ -13,10 +38,6 @@ class RegionFixContext:
     last_row: int
     max_cards: int
 
-    @property
-    def region(self) -> list[list[int]]:
-        return self.state.board[self.first_row : self.last_row]
-
     @property
     def n_columns(self) -> int:
         return self.state.m
@@ -26,22 +47,33 @@ class FixLocalRegions:
     def __init__(self, region_size: int, rng: random.Random) -> None:
         self.region_size = region_size
         self.rng = rng
+        self.board: Board | None = None
+        self.cache: WindowCache | None = None
+        self.initial_stats: Stats = {}
 
     def __call__(self, state: BoardState, max_cards: int) -> BoardState:
-        cloned = deepcopy(state)
-        self._fix_region(cloned, max_cards)
-        return cloned
+        """Re-solves a random window of rows exactly, in place; the value never drops."""
+        if self.cache is None or self.board is not state.board:
+            self.board, self.cache = state.board, window_cache_for(state.board)
+            self.initial_stats = self.cache.stats()
+        self._fix_region(state, max_cards, self.cache)
+        return state
 
-    def _fix_region(self, state: BoardState, max_cards: int) -> None:
+    def stats(self) -> Stats:
+        """Window cache use since this generator first saw the board."""
+        if self.cache is None:
+            return dict(EMPTY_CACHE_STATS)
+        return {key: value - self.initial_stats[key] for key, value in self.cache.stats().items()}
+
+    def _fix_region(self, state: BoardState, max_cards: int, cache: WindowCache) -> None:
         first_row, last_row = self._get_region_boundaries(state)
         context = RegionFixContext(state, first_row, last_row, max_cards)
         initial_mask, final_mask = self._get_boundary_masks(context)
         selection_delta = self._calculate_selection_delta(context)
         self._clear_region_selection(context)
-        result, _ = mwis_bottom_up(
-            context.region, max_cards + selection_delta, initial_mask, final_mask
+        fixed_region = cache.solve(
+            first_row, last_row, initial_mask, final_mask, max_cards + selection_delta
         )
-        _, fixed_region = result
         self._select_found_tiles(fixed_region, context)
 
     def _get_region_boundaries(self, state: BoardState) -> tuple[int, int]:
@@ -59,29 +91,150 @@ class FixLocalRegions:
 
     def _clear_region_selection(self, context: RegionFixContext) -> None:
         for i in range(context.first_row, context.last_row):
-            for j in range(context.state.m):
-                if context.state.selection_grid[i][j]:
-                    context.state.unselect_tile((i, j))
+            context.state.set_row_mask(i, 0)
 
     def _calculate_selection_delta(self, context: RegionFixContext) -> int:
-        n_selected_in_region = 0
-        for i in range(context.first_row, context.last_row):
-            for j in range(context.n_columns):
-                if context.state.selection_grid[i][j]:
-                    n_selected_in_region += 1
+        masks = context.state.masks
+        n_selected_in_region = sum(
+            masks[i].bit_count() for i in range(context.first_row, context.last_row)
+        )
         return n_selected_in_region - context.state.count_selected_tiles()
 
     def _select_found_tiles(self, region: list[int], context: RegionFixContext) -> None:
-        tiles = self._convert_masks_to_tiles(region, context.first_row, context.state.m)
-        for tile in tiles:
-            context.state.select_tile(tile)
-
-    def _convert_masks_to_tiles(
-        self, masks: list[int], first_row: int, n_columns: int
-    ) -> list[Tile]:
-        tiles: list[Tile] = []
-        for i, mask in enumerate(masks):
-            for j in range(n_columns):
-                if mask >> (n_columns - 1 - j) & 1:
-                    tiles.append((first_row + i, j))
-        return tiles
+        for i, mask in enumerate(region):
+            context.state.set_row_mask(context.first_row + i, mask)
+
+
+class GainGuidedRegions(FixLocalRegions):
+    """Picks the window with the largest gain instead of a uniform random one."""
+
+    def __init__(self, region_size: int, rng: random.Random) -> None:
+        super().__init__(region_size, rng)
+        self.stride = max(region_size // WINDOWS_PER_REGION, 1)
+        self.gains: IntArray | None = None
+        self.heap: list[tuple[int, int]] = []
+
+    def __call__(self, state: BoardState, max_cards: int) -> BoardState:
+        if self.board is not state.board:
+            self.gains = None
+        self.max_cards = max_cards
+        state = super().__call__(state, max_cards)
+        first_row, last_row = self.window
+        if state.masks[first_row:last_row] != self.previous_masks:
+            first_start = -(-max(first_row - self.region_size, 0) // self.stride) * self.stride
+            starts = range(first_start, min(last_row + 1, state.n), self.stride)
+            self._update_gains(state, np.array(starts, dtype=np.int64))
+        elif self.gains is not None:
+            self.gains[first_row] = 0
+        return state
+
+    def _get_region_boundaries(self, state: BoardState) -> tuple[int, int]:
+        if self.gains is None:
+            self.gains = np.zeros(state.n, dtype=np.int64)
+            self.heap = []
+            self._update_gains(state, np.arange(0, state.n, self.stride))
+        first_row, last_row = self._pop_best_window(state)
+        self.window = first_row, last_row
+        self.previous_masks = state.masks[first_row:last_row]
+        return first_row, last_row
+
+    def _pop_best_window(self, state: BoardState) -> tuple[int, int]:
+        assert self.gains is not None
+        while self.heap:
+            neg_gain, first_row = heappop(self.heap)
+            if -neg_gain == self.gains[first_row]:
+                return first_row, min(first_row + self.region_size, state.n)
+        return super()._get_region_boundaries(state)
+
+    def _update_gains(self, state: BoardState, starts: IntArray) -> None:
+        assert self.gains is not None and self.cache is not None
+        size = self.region_size
+        full = starts[starts + size <= state.n]
+        if len(full):
+            self.gains[full] = self._window_gains(state, full, size)
+        for first_row in starts[starts + size > state.n].tolist():
+            self.gains[first_row] = self._window_gains(
+                state, np.array([first_row]), state.n - first_row
+            )[0]
+        for first_row, gain in zip(starts.tolist(), self.gains[starts].tolist()):
+            if gain > 0:
+                heappush(self.heap, (-gain, first_row))
+
+    def _window_gains(self, state: BoardState, starts: IntArray, size: int) -> IntArray:
+        assert self.cache is not None
+        tables = self.cache.tables
+        gains = np.zeros(len(starts), dtype=np.int64)
+        slack = self.max_cards - state.count_selected_tiles()
+        n_cards = size * int(tables.popcounts.max()) + 1
+        for first in range(0, len(starts), GAIN_BATCH):
+            batch_starts = starts[first : first + GAIN_BATCH]
+            rows = batch_starts[:, None] + np.arange(size)[None, :]
+            current = row_mask_indices(state, tables, rows)
+            batch = WindowBatch.solve(
+                tables.weights[rows],
+                row_mask_indices(state, tables, batch_starts - 1),
+                row_mask_indices(state, tables, batch_starts + size),
+                tables.popcounts,
+                tables.compatibility,
+                n_cards,
+            )
+            budgets = np.minimum(tables.popcounts[current].sum(axis=1) + slack, n_cards - 1)
+            best = batch.curves()[np.arange(len(batch_starts)), budgets]
+            gains[first : first + GAIN_BATCH] = best - tables.weights[rows, current].sum(axis=1)
+        return gains
+
+
+class FixDisjointRegions:
+    """Re-solves up to `n_windows` disjoint windows per call in one batched DP, in place."""
+
+    def __init__(self, region_size: int, n_windows: int, rng: random.Random) -> None:
+        self.region_size = region_size
+        self.n_windows = n_windows
+        self.rng = rng
+        self.board: Board | None = None
+
+    def __call__(self, state: BoardState, max_cards: int) -> BoardState:
+        if self.board is not state.board:
+            self.board, self.tables = state.board, window_cache_for(state.board).tables
+        size = min(self.region_size, state.n)
+        offset = self.rng.randint(0, min(size, state.n - size))
+        starts = list(range(offset, state.n - size + 1, size + 1))
+        starts = sorted(self.rng.sample(starts, min(self.n_windows, len(starts))))
+        self._fix_regions(state, max_cards, np.array(starts), size)
+        return state
+
+    def stats(self) -> Stats:
+        return {}
+
+    def _split_budget(self, curves: IntArray, window_cards: IntArray, budget: int) -> IntArray:
+        """Splits the cards by max-plus merges within groups of MERGE_GROUP windows."""
+        slack = budget - int(window_cards.sum())
+        budgets = np.zeros(len(curves), dtype=np.int64)
+        for first in range(0, len(curves), MERGE_GROUP):
+            group = slice(first, first + MERGE_GROUP)
+            group_budget = int(window_cards[group].sum()) + slack
+            budgets[group] = allocate_budget(list(curves[group]), group_budget)
+            slack = group_budget - int(budgets[group].sum())
+        return budgets
+
+    def _fix_regions(self, state: BoardState, max_cards: int, starts: IntArray, size: int) -> None:
+        rows = starts[:, None] + np.arange(size)[None, :]
+        current = np.frombuffer(state.masks, dtype=np.uint8)[rows]
+        tables = self.tables
+        window_cards = tables.popcounts[tables.mask_index[current]].sum(axis=1)
+        budget = max_cards - state.count_selected_tiles() + int(window_cards.sum())
+        n_cards = min(budget, size * int(tables.popcounts.max())) + 1
+
+        batch = WindowBatch.solve(
+            tables.weights[rows],
+            row_mask_indices(state, tables, starts - 1),
+            row_mask_indices(state, tables, starts + size),
+            tables.popcounts,
+            tables.compatibility,
+            n_cards,
+        )
+        budgets = self._split_budget(batch.curves(), window_cards, budget)
+        paths: list[list[int]] = batch.paths(budgets).tolist()
+        for window_rows, path in zip(rows.tolist(), paths):
+            for row_index, mask_index in zip(window_rows, path):
+                state.set_row_mask(row_index, tables.masks[mask_index])
@@ -0,0 +1,125 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.dp.windows import WindowBatch
+from src.util.mask_tables import (
+    BoolArray,
+    IntArray,
+    get_compatibility_matrix,
+    get_mask_weights,
+    get_popcounts,
+)
+from src.util.types import Board, Stats
+from src.util.util import generate_non_adjacent_masks
+
+# (first_row, last_row, initial_mask, final_mask)
+type WindowKey = tuple[int, int, int, int]
+type BoardKey = tuple[tuple[int, ...], ...]
+
+WINDOW_CACHE_BYTES = 16 * 2**20
+CACHED_BOARDS = 4
+
+EMPTY_CACHE_STATS: Stats = {"cache_hits": 0, "cache_misses": 0, "cache_saved_time": 0.0}
+
+
+@dataclass
+class BoardTables:
+    masks: list[int]
+    mask_index: IntArray
+    weights: IntArray
+    popcounts: IntArray
+    compatibility: BoolArray
+
+    @classmethod
+    def create(cls, board: Board) -> "BoardTables":
+        n_columns = len(board[0])
+        masks = generate_non_adjacent_masks(n_columns)
+        mask_index = np.zeros(1 << n_columns, dtype=np.int64)
+        mask_index[masks] = np.arange(len(masks))
+        return cls(
+            masks,
+            mask_index,
+            get_mask_weights(board, masks),
+            get_popcounts(masks),
+            get_compatibility_matrix(masks),
+        )
+
+
+class WindowCache:
+    """LRU of solved repair windows of one board, bounded by the bytes of their DP tables."""
+
+    def __init__(self, board: Board, maxbytes: int = WINDOW_CACHE_BYTES) -> None:
+        self.board = board
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.tables = BoardTables.create(board)
+        self.entries: OrderedDict[WindowKey, tuple[WindowBatch, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.saved_time = 0.0
+
+    def solve(
+        self, first_row: int, last_row: int, initial_mask: int, final_mask: int, budget: int
+    ) -> list[int]:
+        """Best masks of rows [first_row, last_row) using at most `budget` cards."""
+        key = (first_row, last_row, initial_mask, final_mask)
+        if (entry := self.entries.get(key)) is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.saved_time += entry[1]
+        else:
+            start = time.perf_counter()
+            batch = self._solve(key)
+            entry = batch, time.perf_counter() - start
+            self.misses += 1
+            self._store(key, entry)
+        path = entry[0].paths(np.array([budget]))[0]
+        return [self.tables.masks[f] for f in path.tolist()]
+
+    def _store(self, key: WindowKey, entry: tuple[WindowBatch, float]) -> None:
+        nbytes = entry[0].nbytes
+        if nbytes > self.maxbytes:
+            return
+        self.entries[key] = entry
+        self.nbytes += nbytes
+        while self.nbytes > self.maxbytes:
+            _, (batch, _) = self.entries.popitem(last=False)
+            self.nbytes -= batch.nbytes
+
+    def _solve(self, key: WindowKey) -> WindowBatch:
+        first_row, last_row, initial_mask, final_mask = key
+        tables = self.tables
+        n_cards = (last_row - first_row) * int(tables.popcounts.max()) + 1
+        return WindowBatch.solve(
+            tables.weights[None, first_row:last_row],
+            tables.mask_index[[initial_mask]],
+            tables.mask_index[[final_mask]],
+            tables.popcounts,
+            tables.compatibility,
+            n_cards,
+        )
+
+    def stats(self) -> Stats:
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_saved_time": self.saved_time,
+        }
+
+
+_caches: OrderedDict[BoardKey, WindowCache] = OrderedDict()
+
+
+def window_cache_for(board: Board) -> WindowCache:
+    """The cache of the board's values, shared by every repair run on them in this process."""
+    key = tuple(map(tuple, board))
+    cache = _caches.get(key)
+    if cache is None:
+        cache = _caches[key] = WindowCache(board)
+        if len(_caches) > CACHED_BOARDS:
+            _caches.popitem(last=False)
+    _caches.move_to_end(key)
+    return cache
@@ -0,0 +1,171 @@
+import math
+import multiprocessing as mp
+import queue
+import random
+import time
+from dataclasses import dataclass, field
+from multiprocessing.queues import Queue
+from multiprocessing.sharedctypes import Synchronized
+from typing import Callable
+
+from src.astar.anytime import AnytimeAStar
+from src.dp.bottom_up_numpy import DPInterrupted, mwis_bottom_up_numpy
+from src.dp.lagrangian import EPSILON, lagrangian_dual
+from src.greedy.board_state import BoardState
+from src.greedy.greedy_and_repair import greedy_and_repair
+from src.util.mask_tables import get_compatibility_matrix, get_mask_weights, get_popcounts
+from src.util.time_measure import measure_time
+from src.util.types import Board, BoundLog, BoundLogResult
+from src.util.util import generate_non_adjacent_masks
+
+# (worker name, value, path or None, upper bound or None)
+type Message = tuple[str, int, list[int] | None, int | None]
+type Worker = Callable[["SharedIncumbent", Board, int, int], None]
+
+POLL_INTERVAL = 0.05
+
+
+@dataclass
+class SharedIncumbent:
+    """Best known value, readable by every worker without locking; paths travel on `messages`."""
+
+    value: "Synchronized[int]"
+    messages: Queue[Message]
+
+    @classmethod
+    def create(cls) -> "SharedIncumbent":
+        return cls(mp.Value("q", 0), mp.Queue())
+
+    def publish(
+        self, source: str, value: int, path: list[int] | None, bound: int | None = None
+    ) -> None:
+        if path is not None:
+            with self.value.get_lock():
+                if value > self.value.value:
+                    self.value.value = value
+        self.messages.put((source, value, path, bound))
+
+
+class SharedAStar(AnytimeAStar):
+    """Anytime A* that prunes with the portfolio incumbent and publishes its own ones."""
+
+    def __init__(self, shared: SharedIncumbent, board: Board, num_of_cards: int) -> None:
+        self.shared = shared
+        super().__init__(board, num_of_cards, weight=1.0, log_every=100)
+
+    def _update_incumbent(self) -> None:
+        super()._update_incumbent()
+        path = self._reconstruct_path(self.current_state)
+        self.shared.publish("astar", int(self.best_profit), path)
+
+    def _poll(self) -> None:
+        # Picks up incumbents found by the other workers.
+        self.best_profit = max(self.best_profit, self.shared.value.value)
+
+
+def _greedy_worker(shared: SharedIncumbent, board: Board, max_cards: int, seed: int) -> None:
+    def publish(state: BoardState) -> None:
+        shared.publish("greedy", state.evaluate_sum(), state.convert_state_to_masks())
+
+    greedy_and_repair(board, max_cards, rng=random.Random(seed), on_improvement=publish)
+
+
+def _astar_worker(shared: SharedIncumbent, board: Board, max_cards: int, seed: int) -> None:
+    astar = SharedAStar(shared, board, max_cards)
+    astar.run()
+    shared.publish("astar", int(astar.best_profit), None, astar.upper_bound())
+
+
+def _dp_worker(shared: SharedIncumbent, board: Board, max_cards: int, seed: int) -> None:
+    masks = generate_non_adjacent_masks(len(board[0]))
+    weights = get_mask_weights(board, masks)
+    popcounts = get_popcounts(masks)
+    compatibility = get_compatibility_matrix(masks)
+    primal, path, dual, _ = lagrangian_dual(weights, popcounts, compatibility, max_cards)
+    bound = math.floor(dual + EPSILON) if math.isfinite(dual) else None
+    shared.publish("dp", primal, [masks[f] for f in path], bound)
+    interrupt = None if bound is None else lambda: shared.value.value >= bound
+    try:
+        value, path = mwis_bottom_up_numpy(board, max_cards, interrupt=interrupt)[:2]
+    except DPInterrupted:
+        return
+    shared.publish("dp", value, path, value)
+
+
+WORKERS: dict[str, Worker] = {"greedy": _greedy_worker, "astar": _astar_worker, "dp": _dp_worker}
+
+
+@dataclass
+class Race:
+    """Incumbent and bound bookkeeping of the portfolio process."""
+
+    n_rows: int
+    start: float = field(default_factory=time.perf_counter)
+    value: int = 0
+    path: list[int] = field(default_factory=list)
+    upper_bound: float = math.inf
+    winner: str = ""
+    log: BoundLog = field(default_factory=lambda: ([], [], [], []))
+
+    def __post_init__(self) -> None:
+        self.path = [0] * self.n_rows
+
+    @property
+    def is_proven(self) -> bool:
+        return self.value >= self.upper_bound
+
+    def receive(self, message: Message) -> None:
+        source, value, path, bound = message
+        if path is not None and value > self.value:
+            self.value, self.path, self.winner = value, path, source
+        if bound is not None:
+            self.upper_bound = min(self.upper_bound, bound)
+        iterations, values, timestamps, bounds = self.log
+        iterations.append(len(iterations))
+        values.append(self.value)
+        timestamps.append(time.perf_counter() - self.start)
+        bounds.append(self.upper_bound)
+
+
+@measure_time()
+def mwis_portfolio(
+    board: Board,
+    max_cards: int,
+    *,
+    workers: tuple[str, ...] = ("greedy", "astar", "dp"),
+    deadline: float | None = None,
+    seed: int = 0,
+) -> BoundLogResult:
+    """Races the `workers` in separate processes until the value is proven or `deadline`."""
+    shared = SharedIncumbent.create()
+    race = Race(len(board))
+    processes = [
+        mp.Process(target=WORKERS[name], args=(shared, board, max_cards, seed), daemon=True)
+        for name in workers
+    ]
+    for process in processes:
+        process.start()
+    try:
+        while not race.is_proven:
+            elapsed = time.perf_counter() - race.start
+            if deadline is not None and elapsed >= deadline:
+                break
+            timeout = POLL_INTERVAL if deadline is None else min(POLL_INTERVAL, deadline - elapsed)
+            try:
+                race.receive(shared.messages.get(timeout=timeout))
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join()
+
+    upper_bound = race.upper_bound if math.isfinite(race.upper_bound) else None
+    stats = {
+        "winner": race.winner,
+        "proven": race.is_proven,
+        "upper_bound": upper_bound,
+        "time_to_result": race.log[2][-1] if race.log[2] else 0.0,
+    }
+    return race.value, race.path, race.log, stats
@@ -1,8 +1,62 @@
+import copy
+import csv
+import random
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
 
+import numpy as np
+import pytest
+
+from src.astar.anytime import run_anytime_astar
 from src.astar.astar import run_astar
+from src.astar.heuristic import BlockBound, ExactBound, LagrangianBound, UnlimitedCardsBound
+from src.beam.beam_search import mwis_beam_search
 from src.dp.bottom_up import mwis_bottom_up
+from src.dp.lagrangian import mwis_lagrangian
+from src.dp.parallel import mwis_parallel
+from src.dp.presolve import Presolved, split_segments
 from src.dp.top_down import mwis_top_down
+from src.experiment.config import AlgorithmConfig, ExperimentPhase
+from src.experiment.distribution import UniformDistribution
+from src.experiment.runner import ExperimentRunner, RunnerConfig
+from src.ga.array_genetic_algorithm import run_array_genetic_algorithm
+from src.ga.crossover import crossover
+from src.ga.evaluation import FitnessEvaluator
+from src.ga.genetic_algorithm import run_genetic_algorithm
+from src.ga.islands import run_island_genetic_algorithm
+from src.ga.mutation import mutation
+from src.ga.population import (
+    evaluate,
+    get_gene_values,
+    mutate,
+    random_population,
+    two_point_crossover,
+)
+from src.ga.q import q
+from src.ga.reproduction import reproduction
+from src.ga.succession import elitism
+from src.ga.unit import Unit, ValueRepair
+from src.greedy.board_state import BoardState, Tile
+from src.greedy.greedy_and_repair import greedy_and_repair
+from src.greedy.greedy_fill import TileHeuristic, greedy_fill, weight, weight_per_neighbors
+from src.greedy.successor_generator import GainGuidedRegions
+from src.greedy.window_cache import WindowCache, window_cache_for
+from src.portfolio.portfolio import mwis_portfolio
+from src.util.types import Board, BoundLogResult, MWISResult
+
+
+def mwis_bottom_up_numpy(board: Board, max_cards: int) -> tuple[MWISResult, float]:
+    return mwis_bottom_up(board, max_cards, engine="numpy")
+
+
+GA_OPERATORS: dict[str, Any] = {
+    "q": q,
+    "mutation": mutation,
+    "reproduction": reproduction,
+    "crossover": crossover,
+    "succession": elitism,
+}
 
 
 @dataclass
@@ -14,7 +68,14 @@ class TestCase:
 
 
 def test_algorithms():
-    algorithms = [mwis_bottom_up, mwis_top_down, run_astar]
+    algorithms = [
+        mwis_bottom_up,
+        mwis_bottom_up_numpy,
+        mwis_top_down,
+        run_astar,
+        run_anytime_astar,
+        mwis_lagrangian,
+    ]
     test_cases = [
         # No values
         TestCase(board=[[]], max_cards=0, result=0),
@@ -47,7 +108,523 @@ def test_algorithms():
     for algo in algorithms:
         for tc in test_cases:
             result, _ = algo(tc.board, tc.max_cards)
+            result = result[0]
             assert result == tc.result, (
                 f"Alghortim {algo.__name__} failed for board={tc.board}",
                 f"max_cards={tc.max_cards}; expected={tc.result} got={result}",
             )
+
+
+def random_board(rng: random.Random, n_rows: int) -> Board:
+    return [[rng.randint(-10, 10) for _ in range(4)] for _ in range(n_rows)]
+
+
+def path_value(board: Board, path: list[int]) -> int:
+    return sum(
+        v for row, mask in zip(board, path) for j, v in enumerate(row) if mask >> (3 - j) & 1
+    )
+
+
+def assert_valid_solution(
+    board: Board, max_cards: int, result: MWISResult, initial_mask: int = 0, final_mask: int = 0
+) -> None:
+    value, path = result[0], result[1]
+    assert value == path_value(board, path)
+    assert len(path) == len(board)
+    assert sum(m.bit_count() for m in path) <= max_cards
+    assert not path[0] & initial_mask and not path[-1] & final_mask
+    assert all(not a & b and not a & (a << 1) for a, b in zip(path, path[1:]))
+
+
+def test_dp_variants_agree():
+    rng = random.Random(0)
+    for _ in range(50):
+        board = random_board(rng, rng.randint(2, 12))
+        max_cards = rng.randint(0, 2 * len(board))
+        initial_mask, final_mask = rng.choice([0, 1, 2, 4, 5, 8, 9, 10]), rng.choice([0, 5, 10])
+        masks = (initial_mask, final_mask)
+        (expected, path), _ = mwis_bottom_up(board, max_cards, *masks)
+        assert_valid_solution(board, max_cards, (expected, path), *masks)
+        variants = [
+            mwis_bottom_up(board, max_cards, *masks, engine="numpy"),
+            mwis_bottom_up(board, max_cards, *masks, engine="numpy", checkpoint_every=1),
+            mwis_bottom_up(board, max_cards, *masks, engine="numpy", checkpoint_every=3),
+            mwis_top_down(board, max_cards, initial_mask=initial_mask, final_mask=final_mask),
+        ]
+        for result, _ in variants:
+            assert result[0] == expected
+            assert_valid_solution(board, max_cards, result, *masks)
+
+
+def test_lagrangian_matches_exact_dp():
+    rng = random.Random(1)
+    for _ in range(100):
+        board = random_board(rng, rng.randint(1, 30))
+        max_cards = rng.randint(0, 2 * len(board))
+        (expected, _), _ = mwis_bottom_up(board, max_cards, engine="numpy")
+        result, _ = mwis_lagrangian(board, max_cards, band=1)
+        assert result[0] == expected
+        assert_valid_solution(board, max_cards, result)
+        assert len(result) == 3 and result[2]["dual_bound"] >= expected
+
+
+def test_presolve_matches_exact_dp():
+    rng = random.Random(2)
+    solvers = [Presolved(mwis_bottom_up), Presolved(mwis_top_down), Presolved(run_astar)]
+    for _ in range(50):
+        board = [[rng.randint(-10, 3) for _ in range(4)] for _ in range(rng.randint(1, 25))]
+        max_cards = rng.randint(0, len(board))
+        (expected, _), _ = mwis_bottom_up(board, max_cards)
+        for solver in solvers:
+            result, _ = solver(board, max_cards)
+            assert result[0] == expected
+            assert_valid_solution(board, max_cards, result)
+
+
+def test_split_segments():
+    board = [[-1, 0, -2, 0], [1, -1, -1, -1], [0, 2, 0, 0], [0, 0, 0, 0], [0, 0, 0, 5]]
+    assert split_segments(board) == [(1, 3), (4, 5)]
+
+
+def test_parallel_matches_exact_dp():
+    rng = random.Random(3)
+    for _ in range(30):
+        board = random_board(rng, rng.randint(1, 40))
+        max_cards = rng.randint(0, 2 * len(board))
+        (expected, _), _ = mwis_bottom_up(board, max_cards, engine="numpy")
+        result, _ = mwis_parallel(board, max_cards, n_chunks=rng.randint(1, 7), n_workers=1)
+        assert result[0] == expected
+        assert_valid_solution(board, max_cards, result)
+    board = random_board(rng, 50)
+    (expected, _), _ = mwis_bottom_up(board, 30, engine="numpy")
+    result, _ = mwis_parallel(board, 30, n_chunks=4, n_workers=2)
+    assert result[0] == expected
+    assert_valid_solution(board, 30, result)
+
+
+def test_astar_heuristics():
+    rng = random.Random(4)
+    heuristics = [
+        BlockBound(3),
+        UnlimitedCardsBound(),
+        LagrangianBound(0.0),
+        LagrangianBound(2.5),
+        ExactBound(),
+    ]
+    for _ in range(30):
+        board = random_board(rng, rng.randint(1, 25))
+        max_cards = rng.randint(0, 2 * len(board))
+        (expected, _), _ = mwis_bottom_up(board, max_cards, engine="numpy")
+        for heuristic in heuristics:
+            result, _ = run_astar(board, max_cards, heuristic=heuristic)
+            assert result[0] == expected, str(heuristic)
+            assert_valid_solution(board, max_cards, result)
+
+
+def test_anytime_astar_bounds():
+    rng = random.Random(5)
+    for _ in range(30):
+        board = random_board(rng, rng.randint(1, 40))
+        max_cards = rng.randint(0, 2 * len(board))
+        (expected, _), _ = mwis_bottom_up(board, max_cards, engine="numpy")
+        for max_expansions in [1, 10, None]:
+            result, _ = run_anytime_astar(board, max_cards, max_expansions=max_expansions)
+            value, _, (_, values, _, bounds), stats = result
+            assert_valid_solution(board, max_cards, result)
+            assert value <= expected <= stats["upper_bound"]
+            assert values == sorted(values) and bounds[-1] == stats["upper_bound"]
+            if max_expansions is None:
+                assert value == expected and stats["gap"] == 0
+
+        incumbent = (expected, mwis_bottom_up(board, max_cards)[0][1])
+        result, _ = run_anytime_astar(board, max_cards, incumbent=incumbent)
+        assert result[0] == expected
+        assert_valid_solution(board, max_cards, result)
+
+    board = random_board(rng, 40)
+    board[10] = board[25] = [0, 0, 0, 0]
+    (expected, _), _ = mwis_bottom_up(board, 30, engine="numpy")
+    result, _ = Presolved(run_anytime_astar)(board, 30, max_expansions=20)
+    value, _, (_, values, _, bounds), stats = cast(BoundLogResult, result)
+    assert value == values[-1] <= expected <= stats["upper_bound"] == bounds[-1]
+    assert stats["gap"] == (stats["upper_bound"] - value) / max(stats["upper_bound"], 1)
+    assert stats["bytes_per_expanded"] <= stats["memory_bytes"] and stats["final_weight"] >= 1
+
+
+def test_portfolio_returns_proven_optimum():
+    rng = random.Random(6)
+    for _ in range(5):
+        board = random_board(rng, rng.randint(1, 30))
+        max_cards = rng.randint(0, 2 * len(board))
+        (expected, _), _ = mwis_bottom_up(board, max_cards, engine="numpy")
+        result, _ = mwis_portfolio(board, max_cards)
+        assert result[0] == expected and result[3]["proven"]
+        assert_valid_solution(board, max_cards, result)
+
+        result, _ = Presolved(mwis_portfolio)(board, max_cards)
+        stats = result[-1]
+        assert result[0] == expected and isinstance(stats, dict) and stats["proven"] is True
+        assert_valid_solution(board, max_cards, result)
+
+        result, _ = mwis_portfolio(board, max_cards, workers=("greedy",))
+        assert result[0] <= expected and not result[3]["proven"]
+        assert_valid_solution(board, max_cards, result)
+
+
+def test_beam_search():
+    rng = random.Random(7)
+    for _ in range(30):
+        board = random_board(rng, rng.randint(1, 30))
+        max_cards = rng.randint(0, 2 * len(board))
+        (expected, _), _ = mwis_bottom_up(board, max_cards, engine="numpy")
+        for beam_width in [1, 8]:
+            result, _ = mwis_beam_search(board, max_cards, beam_width=beam_width)
+            assert result[0] <= expected
+            assert_valid_solution(board, max_cards, result)
+        # A beam holding every (mask, cards) pair is the exact DP.
+        for heuristic in [None, BlockBound()]:
+            result, _ = mwis_beam_search(
+                board, max_cards, beam_width=8 * (max_cards + 1), heuristic=heuristic
+            )
+            assert result[0] == expected
+            assert_valid_solution(board, max_cards, result)
+
+
+def reference_greedy_fill(state: BoardState, max_cards: int, heuristic: TileHeuristic) -> None:
+    while state.count_selected_tiles() < max_cards:
+        best_score, best_tile = 0, None
+        for i in range(state.n):
+            for j in range(state.m):
+                if state.can_tile_be_selected((i, j)):
+                    score = heuristic(state, (i, j))
+                    if score > best_score:
+                        best_score, best_tile = score, (i, j)
+        if best_tile is None:
+            return
+        state.select_tile(best_tile)
+
+
+def weight_per_free_neighbors(state: BoardState, tile: Tile) -> float:
+    free = [t for t in state.neighbors(tile) if state.can_tile_be_selected(t)]
+    return weight(state, tile) / (1 + len(free))
+
+
+def test_greedy_fill_matches_full_rescan():
+    rng = random.Random(8)
+    heuristics = [weight, weight_per_neighbors, weight_per_free_neighbors]
+    for _ in range(30):
+        board = [[rng.randint(-3, 5) for _ in range(4)] for _ in range(rng.randint(1, 30))]
+        max_cards = rng.randint(0, 2 * len(board))
+        for heuristic in heuristics:
+            expected, state = BoardState(board), BoardState(board)
+            reference_greedy_fill(expected, max_cards, heuristic)
+            greedy_fill(state, max_cards, heuristic)
+            assert state.convert_state_to_masks() == expected.convert_state_to_masks()
+            assert state.evaluate_sum() == path_value(board, state.convert_state_to_masks())
+
+    state = BoardState([[5, -2, 3, 1]])
+    state.unselect_tile((0, 0))
+    state.select_tile((0, 2))
+    state.select_tile((0, 2))
+    assert state.evaluate_sum() == 3 and state.count_selected_tiles() == 1
+
+
+def test_greedy_and_repair_tracks_objective():
+    rng = random.Random(9)
+    for _ in range(10):
+        board = random_board(rng, rng.randint(2, 40))
+        max_cards = rng.randint(0, 2 * len(board))
+        result, _ = greedy_and_repair(board, max_cards, n_iter=20, rng=rng)
+        value, path, (_, evals, _), _ = result
+        assert value == path_value(board, path)
+        assert evals == sorted(evals)
+        assert_valid_solution(board, max_cards, result)
+
+
+def test_batched_window_repair():
+    rng = random.Random(10)
+    for _ in range(20):
+        board = random_board(rng, rng.randint(1, 60))
+        max_cards = rng.randint(0, 2 * len(board))
+        (expected, _), _ = mwis_bottom_up(board, max_cards, engine="numpy")
+        result, _ = greedy_and_repair(
+            board, max_cards, n_iter=10, region_percent_size=0.1, windows_per_sweep=4, rng=rng
+        )
+        value, path, (_, evals, _), _ = result
+        assert value == path_value(board, path) <= expected
+        assert evals == sorted(evals)
+        assert_valid_solution(board, max_cards, result)
+
+
+def test_window_cache_reuses_repairs():
+    board = random_board(random.Random(11), 30)
+    first, _ = greedy_and_repair(board, 20, n_iter=50, rng=random.Random(0))
+    second, _ = greedy_and_repair(board, 20, n_iter=50, rng=random.Random(0))
+    assert first[:2] == second[:2] and first[2][:2] == second[2][:2]
+    assert first[3]["cache_hits"] + first[3]["cache_misses"] == 50
+    assert second[3]["cache_misses"] == 0 and second[3]["cache_hits"] == 50
+    copy, _ = greedy_and_repair([row[:] for row in board], 20, n_iter=50, rng=random.Random(0))
+    assert copy[:2] == first[:2] and copy[3]["cache_misses"] == 0
+
+    cache = WindowCache(board, maxbytes=20_000)
+    for first_row in range(20):
+        path = cache.solve(first_row, first_row + 5, 0, 0, 4)
+        assert len(path) == 5 and sum(mask.bit_count() for mask in path) <= 4
+        assert 0 < cache.nbytes <= cache.maxbytes
+    assert 0 < len(cache.entries) < 20
+
+
+def test_gain_guided_repair():
+    rng = random.Random(12)
+    for _ in range(10):
+        board = random_board(rng, rng.randint(2, 60))
+        max_cards = rng.randint(0, 2 * len(board))
+        result, _ = greedy_and_repair(board, max_cards, n_iter=30, selection="gain", rng=rng)
+        value, path, (_, evals, _), _ = result
+        assert value == path_value(board, path)
+        assert evals == sorted(evals)
+        assert_valid_solution(board, max_cards, result)
+
+    board = random_board(rng, 60)
+    window_cache_for(board)
+    state = BoardState(copy.deepcopy(board))
+    greedy_fill(state, 30, weight)
+    generator = GainGuidedRegions(6, rng)
+    state = generator(state, 30)
+    gains = generator.gains
+    for _ in range(20):
+        state = generator(state, 30)
+    assert gains is not None and generator.gains is gains
+
+
+def test_stopping_criteria():
+    rng = random.Random(13)
+    board = [[rng.randint(-1000, 1000) for _ in range(4)] for _ in range(200)]
+    result, _ = greedy_and_repair(board, 200, n_iter=None, patience=5, rng=random.Random(0))
+    iterations, evals, timestamps = result[2]
+    assert len(iterations) == len(evals) == len(timestamps) > 7
+    assert timestamps == sorted(timestamps)
+    assert evals[-7] < evals[-6] == evals[-1]
+    assert_valid_solution(board, 200, result)
+
+    result, elapsed = greedy_and_repair(board, 200, n_iter=None, deadline=0.2, rng=rng)
+    assert 0.2 <= result[2][2][-1] <= elapsed
+
+    target = evals[-1]
+    result, _ = greedy_and_repair(board, 200, target=target, rng=random.Random(0))
+    assert result[0] == target and result[2][1][-2] < target
+
+    result, _ = run_genetic_algorithm(
+        board,
+        200,
+        **GA_OPERATORS,
+        population_count=10,
+        probability_of_mutation=0.01,
+        probability_of_crossover=0.9,
+        fes=None,
+        patience=3,
+        rng=rng,
+    )
+    assert result[2][1][-4] == result[2][1][-1] == result[0]
+
+
+def test_unit_offspring_stay_valid():
+    rng = random.Random(15)
+    random.seed(15)
+    for _ in range(50):
+        n_rows = rng.randint(1, 40)
+        max_cards = rng.randint(0, 2 * n_rows)
+        parents = [Unit(n_rows, max_cards) for _ in range(2)]
+        offspring = [*parents[0].cross(parents[1]), parents[0].mutate(0.3), parents[1].mutate(1.0)]
+        for unit in parents + offspring:
+            assert unit.cards == sum(g.bit_count() for g in unit.genes) <= max_cards
+            assert all(g in Unit.choices for g in unit.genes)
+            assert all(a & b == 0 for a, b in zip(unit.genes, unit.genes[1:]))
+
+
+def test_value_aware_repair():
+    rng = random.Random(18)
+    random.seed(18)
+    for _ in range(30):
+        board = random_board(rng, rng.randint(1, 40))
+        max_cards = rng.randint(0, 2 * len(board))
+        genes = Unit(len(board), 4 * len(board), [rng.choice(Unit.choices) for _ in board]).genes
+        cells = sorted(
+            (
+                board[row][col]
+                for row, gene in enumerate(genes)
+                for col in range(4)
+                if gene >> col & 1
+            ),
+            reverse=True,
+        )
+        unit = Unit(len(board), max_cards, genes[:], ValueRepair(board))
+        assert q(unit, board) == sum(cells[:max_cards])
+
+        refilled = Unit(len(board), max_cards, genes[:], ValueRepair(board, refill=True))
+        assert refilled.cards == sum(g.bit_count() for g in refilled.genes) <= max_cards
+        assert all(a & b == 0 for a, b in zip(refilled.genes, refilled.genes[1:]))
+        assert all(g in Unit.choices for g in refilled.genes)
+        if refilled.cards < max_cards:
+            state = BoardState(board)
+            for row, gene in enumerate(refilled.genes):
+                for col in range(4):
+                    if gene >> col & 1:
+                        state.select_tile((row, col))
+            assert not any(
+                board[row][col] > 0 and state.can_tile_be_selected((row, col))
+                for row in range(len(board))
+                for col in range(4)
+            )
+
+        for child in refilled.cross(unit) + (refilled.mutate(0.3),):
+            assert child.cards == sum(g.bit_count() for g in child.genes) <= max_cards
+            assert all(a & b == 0 for a, b in zip(child.genes, child.genes[1:]))
+
+
+def test_fitness_delta_evaluation():
+    rng = random.Random(17)
+    random.seed(17)
+    for _ in range(20):
+        board = random_board(rng, rng.randint(1, 40))
+        max_cards = rng.randint(0, 2 * len(board))
+        evaluator = FitnessEvaluator(q, board)
+        population = [Unit(len(board), max_cards) for _ in range(4)]
+        for _ in range(5):
+            children = [*population[0].cross(population[1]), *population[2].cross(population[3])]
+            population = [child.mutate(0.2) for child in children]
+            for unit in population:
+                assert evaluator(unit) == q(unit, board)
+                assert unit.parent is None and unit.changes is None
+        stats = evaluator.stats()
+        assert stats["fitness_evaluations"] + stats["fitness_cache_hits"] == 4
+        assert stats["fitness_delta_evaluations"] == 5 * 8
+        assert evaluator(population[0]) == q(population[0], board)
+        assert evaluator.cache_hits == stats["fitness_cache_hits"] + 1
+
+
+def test_memetic_genetic_algorithm():
+    rng = random.Random(19)
+    board = random_board(rng, 60)
+    state = BoardState(board)
+    greedy_fill(state, 40, weight)
+    result, elapsed = run_genetic_algorithm(
+        board,
+        40,
+        **GA_OPERATORS,
+        population_count=10,
+        probability_of_mutation=0.05,
+        probability_of_crossover=0.9,
+        fes=200,
+        num_of_best_survivors=2,
+        rng=rng,
+        memetic=True,
+        local_search_top_k=2,
+        local_search_steps=3,
+    )
+    value, genes, (_, evals, _), stats = result
+    assert value == q(Unit(len(board), 40, list(genes)), board) == evals[-1]
+    assert evals[0] >= state.evaluate_sum() and evals == sorted(evals)
+    assert stats["local_search_repairs"] == 2 * 3 * (len(evals) - 1)
+    assert 0 < stats["seeding_time"] + stats["local_search_time"] <= elapsed
+
+
+def test_island_genetic_algorithm():
+    rng = random.Random(16)
+    board = random_board(rng, 30)
+    for topology in ("ring", "random"):
+        result, _ = run_island_genetic_algorithm(
+            board,
+            20,
+            **GA_OPERATORS,
+            population_count=20,
+            probability_of_mutation=0.05,
+            probability_of_crossover=0.9,
+            fes=2000,
+            num_of_best_survivors=2,
+            n_islands=3,
+            migration_interval=5,
+            topology=topology,
+            rng=rng,
+        )
+        value, genes, (_, evals, _), stats = result
+        assert value == q(Unit(len(board), 20, list(genes)), board) == evals[-1]
+        assert evals == sorted(evals) and len(evals) == 2000 // 3 // 6 + 1
+        assert stats["island_value_max"] == value and stats["migrations"] == 3 * (len(evals) // 5)
+        assert len(stats["island_logs"]) == 3
+        assert max(log[1][-1] for log in stats["island_logs"]) == value
+
+
+def test_array_genetic_algorithm():
+    rng = random.Random(14)
+    np_rng = np.random.default_rng(14)
+    for _ in range(10):
+        board = random_board(rng, rng.randint(1, 40))
+        max_cards = rng.randint(0, 2 * len(board))
+        population = random_population(20, len(board), max_cards, np_rng)
+        children = two_point_crossover(population, 0.9, 20, max_cards, np_rng)
+        children = mutate(children, 0.2, max_cards, np_rng)
+        fitness = evaluate(children, get_gene_values(board))
+        for genes, value in zip(children.tolist(), fitness.tolist()):
+            assert value == q(Unit(len(board), max_cards, list(genes)), board)
+            assert all(a & b == 0 for a, b in zip(genes, genes[1:]))
+            assert sum(g.bit_count() for g in genes) <= max_cards
+        unchanged = np.zeros((8, len(board)), dtype=np.uint8)
+        assert (mutate(unchanged, 0.0, max_cards, np_rng) == unchanged).all()
+
+        result, _ = run_array_genetic_algorithm(
+            board,
+            max_cards,
+            population_count=20,
+            probability_of_mutation=0.05,
+            probability_of_crossover=0.9,
+            fes=400,
+            num_of_best_survivors=2,
+            rng=rng,
+        )
+        value, genes, (_, evals, _) = result
+        assert value == q(Unit(len(board), max_cards, list(genes)), board) == evals[-1]
+        assert evals == sorted(evals) and len(evals) == 21
+
+
+def run_smoke_phase(configs: list[AlgorithmConfig], output_path: Path) -> None:
+    phase = ExperimentPhase(
+        name="smoke",
+        board_heights=[12],
+        distributions=[UniformDistribution(-1000, 1000)],
+        max_cards_percents=[0.25, 1.0],
+        boards_per_config=1,
+        repetitions=2,
+    )
+    ExperimentRunner(RunnerConfig(phase, configs, output_path, 7)).run_parallel(1)
+    for config in configs:
+        with open(output_path / "tables" / f"{config.name}.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 2 * len(list(config.get_configurations()))
+
+
+def test_runner_default_configs(tmp_path: Path):
+    run_smoke_phase(AlgorithmConfig.get_default_configs(), tmp_path)
+
+
+def test_runner_presolve_configs(tmp_path: Path):
+    configs = AlgorithmConfig.get_default_configs(presolve=True)
+    run_smoke_phase(configs, tmp_path)
+
+
+def test_runner_keeps_presolved_astar_sequential(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    run_smoke_phase([AlgorithmConfig.default_algo_config("astar").with_presolve()], tmp_path)
+    assert "Phase smoke: 0 parallel, 2 sequential tasks" in capsys.readouterr().out
+
+
+def test_runner_timed_and_process_configs(tmp_path: Path):
+    configs = AlgorithmConfig.get_default_configs(time_budgets=[0.05])
+    configs = [c for c in configs if c.name.endswith("-timed")]
+    configs += [
+        AlgorithmConfig.default_algo_config(name)
+        for name in ("ga-islands", "portfolio", "astar-anytime", "dynamic-parallel")
+    ]
+    configs.append(AlgorithmConfig.default_algo_config("portfolio").with_presolve())
+    run_smoke_phase(configs, tmp_path)
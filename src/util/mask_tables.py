@@ -0,0 +1,38 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from src.util.types import Board
+
+type IntArray = NDArray[np.int64]
+type BoolArray = NDArray[np.bool_]
+
+# Sentinel for unreachable DP states, far enough from int64 min to survive additions.
+NEG_INF = int(np.iinfo(np.int64).min // 4)
+
+
+def get_board_array(board: Board) -> IntArray:
+    n_columns = len(board[0]) if board else 0
+    return np.array(board, dtype=np.int64).reshape(len(board), n_columns)
+
+
+def get_masks_bits_matrix(masks: list[int], size: int) -> IntArray:
+    bits = [[(mask >> (size - j - 1)) & 1 for j in range(size)] for mask in masks]
+    return np.array(bits, dtype=np.int64).reshape(len(masks), size)
+
+
+def get_mask_weights(board: Board, masks: list[int]) -> IntArray:
+    values = get_board_array(board)
+    return values @ get_masks_bits_matrix(masks, values.shape[1]).T
+
+
+def get_popcounts(masks: list[int]) -> IntArray:
+    return np.array([m.bit_count() for m in masks], dtype=np.int64)
+
+
+def get_compatibility_matrix(masks: list[int]) -> BoolArray:
+    array = np.array(masks, dtype=np.int64)
+    return (array[:, None] & array[None, :]) == 0
+
+
+def get_compatible_with(masks: list[int], mask: int) -> BoolArray:
+    return (np.array(masks, dtype=np.int64) & mask) == 0
@@ -0,0 +1,51 @@
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class StoppingCriterion:
+    """Stops after `max_iter`, `deadline` seconds, `patience` stale iterations or `target`."""
+
+    max_iter: int | None = None
+    deadline: float | None = None
+    patience: int | None = None
+    target: float | None = None
+    iterations: list[int] = field(default_factory=list)
+    values: list[float] = field(default_factory=list)
+    timestamps: list[float] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.max_iter is None and self.deadline is None and self.patience is None:
+            raise ValueError("One of max_iter, deadline or patience must be set")
+        self.start = time.perf_counter()
+        self.best = float("-inf")
+        self.last_improvement = 0
+
+    def update(self, value: float) -> None:
+        iteration = len(self.iterations)
+        if value > self.best:
+            self.best = value
+            self.last_improvement = iteration
+        self.iterations.append(iteration)
+        self.values.append(value)
+        self.timestamps.append(time.perf_counter() - self.start)
+
+    def should_stop(self) -> bool:
+        iteration = len(self.iterations) - 1
+        if self.max_iter is not None and iteration >= self.max_iter:
+            return True
+        if self.deadline is not None and time.perf_counter() - self.start >= self.deadline:
+            return True
+        if self.patience is not None and iteration - self.last_improvement >= self.patience:
+            return True
+        return self.target is not None and self.best >= self.target
+
+    @property
+    def log(self) -> tuple[list[int], list[float], list[float]]:
+        return self.iterations, self.values, self.timestamps
+
+
+def pad_to_longest(logs: list[list[float]]) -> list[list[float]]:
+    """Extends every log with its last value to the length of the longest one."""
+    length = max(len(log) for log in logs)
+    return [log + log[-1:] * (length - len(log)) for log in logs]
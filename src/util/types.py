@@ -1,13 +1,21 @@
 from typing import Any, Protocol
 
 type Board = list[list[int]]
-type Log = tuple[list[int], list[float]]
+# (iterations, values, timestamps)
+type Log = tuple[list[int], list[float], list[float]]
+# (iterations, incumbent values, timestamps, upper bounds)
+type BoundLog = tuple[list[int], list[float], list[float], list[float]]
+type Stats = dict[str, Any]
 
 type MWISBase = tuple[int, list[int]]
-type MWISResult = MWISBase | tuple[*MWISBase, Log]
+type LogResult = tuple[*MWISBase, Log]
+type StatsResult = tuple[*MWISBase, Stats]
+type LogStatsResult = tuple[*MWISBase, Log, Stats]
+type BoundLogResult = tuple[*MWISBase, BoundLog, Stats]
+type MWISResult = MWISBase | LogResult | StatsResult | LogStatsResult | BoundLogResult
 
 
 class MWISSolver(Protocol):
     def __call__(
-        self, board: Board, max_cards: int, *args: Any, **kwargs: Any
+        self, board: Board, max_cards: int, /, *args: Any, **kwargs: Any
     ) -> tuple[MWISResult, float]: ...